@@ -6,13 +6,46 @@
 # providing a unified interface for working with images across different formats.
 # It is used in this script to load, convert to grayscale, resize, and access pixel data
 # for the purpose of creating ASCII art representations of images.
-from PIL import Image
+from PIL import Image, ImageChops, ImageDraw, ImageFont, ImageSequence
+
+# OrderedDict keeps the render cache in least-recently-used order, and os is used to identify
+# source files by path, modification time and size.
+import os
+from collections import OrderedDict
+
+# bisect places stage timings into histogram buckets, and time measures them when instrumentation is enabled.
+import bisect
+import time
+
+# re finds runs of identical colors in the quantized color rows with a single C-level scan per row.
+import re
+
+# hashlib, mmap and struct implement the compact luminance grid files, which are memory mapped when opened.
+import hashlib
+import mmap
+import struct
 
 # Define a string of ASCII characters ordered by perceived brightness, used to map pixel brightness to characters.
 # ASCII characters are used to create a gradient of characters from light to dark
 # which correspond to increasing levels of gray in an image.
 ASCII_CHARS = "@%#*+=-:. "
 
+# Named character ramps, each ordered from dark to light, selectable with `ASCII_Art_Studio.set_ramp`.
+# More can be added with `register_ramp`.
+CHARACTER_RAMPS = {
+    'default': ASCII_CHARS,
+    'detailed': "$@B%8&WM#*oahkbdpqwmZO0QLCJUYXzcvunxrjft/\\|()1{}[]?-_+~<>i!lI;:,\"^`'. ",
+    'simple': "#+-. ",
+    'binary': "# ",
+}
+
+# The ramps shipped with the studio, which `register_ramp` refuses to redefine.
+BUILT_IN_RAMPS = frozenset(CHARACTER_RAMPS)
+
+# The share of the darkest and of the brightest pixels, in percent, that auto-levels clips when it
+# stretches the luminance of the resized image to the full range.
+AUTO_LEVELS_CUTOFF_PERCENT = 0.5
+
 # The width for the ASCII art output. This determines how many characters wide the ASCII art will be.
 ASCII_ART_WIDTH_IN_CHARACTERS = 50
 # Adjusts the height to ensure that the aspect ratio is maintained in a text display.
@@ -25,22 +58,565 @@ FONT_ADJUSTMENT_FACTOR_FOR_DISPLAY_ASPECT_RATIO = 0.55
 # Maximum grayscale value for a pixel, used in mapping pixel brightness to ASCII characters.
 GRAYSCALE_MAX_VALUE = 256
 
+# The rendering engine used when none is requested explicitly. The 'lut' engine maps the whole resized
+# image through a precomputed 256-entry table in one pass, while 'reference' walks the image pixel by pixel.
+DEFAULT_RENDER_ENGINE = 'lut'
+
+# The message `ASCII_Art_Studio.load` returns when an image was loaded; anything else is an error.
+LOAD_SUCCESS_MESSAGE = "Image loaded successfully."
+
+# Default limits of the render cache: the maximum number of cached renders and their total size in bytes.
+RENDER_CACHE_MAX_ENTRIES = 32
+RENDER_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+# The number of rows converted at a time by the streaming renderer. Peak memory for the text output
+# is bounded by one band of this many rows instead of the whole ASCII art.
+RENDER_BAND_ROWS = 64
+
+# Frame duration in milliseconds used for animation frames that do not specify one (or specify 0),
+# matching what browsers do for such GIFs.
+DEFAULT_FRAME_DURATION_MS = 100
+
+# Upper bounds, in milliseconds, of the histogram buckets used by Stage_Stats. Durations above the
+# last bound fall into a final overflow bucket.
+STATS_HISTOGRAM_BOUNDS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+# The largest mean absolute luminance difference, in gray levels, allowed between an image resized from
+# the mip pyramid and the same image resized directly from full resolution.
+PYRAMID_MAX_MEAN_ERROR = 2.5
+
+# How many times larger than the target size the pyramid level used for resampling must be. The margin
+# lets the resampling filter average over several source pixels, which keeps the result close to a
+# direct resize from full resolution.
+PYRAMID_OVERSAMPLING = 4
+
+# Color render modes: 24-bit 'truecolor' escapes or the xterm 'color256' palette.
+COLOR_PALETTES = ('truecolor', 'color256')
+
+# Truecolor channels are rounded to multiples of this step so that neighbouring cells with nearly the
+# same color share one escape sequence.
+COLOR_QUANTIZATION_STEP = 8
+
+# ANSI sequence restoring the default colors at the end of every colored line.
+ANSI_RESET = b'\x1b[0m'
+
+# The glyph-matching render mode describes every character cell by the brightness of a grid of
+# (columns, rows) sub-blocks. The rows outnumber the columns because text cells are taller than wide.
+GLYPH_FEATURE_GRID = (4, 7)
+
+# The printable ASCII characters the glyph-matching render mode chooses from.
+GLYPH_CHARACTERS = ''.join(chr(code) for code in range(32, 127))
+
+# The font size used to rasterize the glyphs before they are reduced to feature vectors.
+GLYPH_FONT_SIZE = 28
+
+# Where the rasterized glyph features are cached between runs.
+GLYPH_INDEX_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'ascii_art_studio')
+
+# The luminance grid file format: a fixed header followed by the resized 8-bit luminance values row by
+# row. The header holds the magic bytes, the format version, the grid and source dimensions, the
+# aspect factor used for the resize and the SHA-256 digest of the source file.
+LUMINANCE_GRID_MAGIC = b'AASG'
+LUMINANCE_GRID_VERSION = 1
+LUMINANCE_GRID_HEADER = struct.Struct('<4sHIIIId32s')
+LUMINANCE_GRID_EXTENSION = '.aasg'
+
+# Matches a run of identical 1-byte (color256) or 3-byte (truecolor) color codes.
+_COLOR_RUN_PATTERNS = {
+    'color256': re.compile(rb'(.)\1*', re.DOTALL),
+    'truecolor': re.compile(rb'(...)\1*', re.DOTALL),
+}
+
+def _build_ascii_lut(ascii_chars=ASCII_CHARS):
+    """
+    Precompute the character for every possible 8-bit grayscale value as a 256-byte translation table.
+    The table is built with the same formula as `ASCII_Art_Studio._get_ascii_char`, including its
+    integer truncation, so translating a grayscale buffer through it gives byte-identical output.
+
+    Parameters:
+    - ascii_chars: str, the characters ordered from dark to light.
+
+    Returns:
+    - bytes, a table suitable for `bytes.translate`.
+    """
+    if not ascii_chars or not ascii_chars.isascii():
+        raise ValueError("The character ramp must be a non-empty string of ASCII characters.")
+    return bytes(
+        ord(ascii_chars[int(gray_value / GRAYSCALE_MAX_VALUE * (len(ascii_chars) - 1))])
+        for gray_value in range(256)
+    )
+
+def _clip_gray(value):
+    # Rounds a computed luminance and clamps it to the 8-bit range.
+    return min(255, max(0, int(round(value))))
+
+def _gamma_curve(gamma):
+    # Brightens the midtones for a gamma above 1 and darkens them below 1; black and white are kept.
+    if gamma <= 0:
+        raise ValueError("The gamma must be greater than 0.")
+    return lambda value: _clip_gray(255 * (value / 255) ** (1 / gamma))
+
+def _contrast_curve(factor):
+    # Scales the distance of every value from the middle gray.
+    return lambda value: _clip_gray((value - 128) * factor + 128)
+
+def _invert_curve():
+    # Swaps dark and light.
+    return lambda value: 255 - value
+
+def _levels_curve(low, high):
+    # Stretches the values between `low` and `high` to the full range, clipping the rest.
+    if high <= low:
+        return lambda value: value
+    return lambda value: _clip_gray((value - low) * 255 / (high - low))
+
+# Tone curve factories by name. Each takes the curve's parameters and returns a function mapping an
+# 8-bit luminance to another one. More can be added with `register_curve`.
+TONE_CURVES = {
+    'gamma': _gamma_curve,
+    'contrast': _contrast_curve,
+    'invert': _invert_curve,
+    'levels': _levels_curve,
+}
+
+# The curves shipped with the studio, which `register_curve` refuses to redefine.
+BUILT_IN_CURVES = frozenset(TONE_CURVES)
+
+def register_ramp(name, ascii_chars):
+    """
+    Register a named character ramp for `ASCII_Art_Studio.set_ramp`. A ramp registered earlier under
+    the same name is replaced, but the built-in ramps cannot be redefined.
+
+    Parameters:
+    - name: str, the name of the ramp.
+    - ascii_chars: str, the characters ordered from dark to light.
+
+    Raises:
+    - ValueError: if the name is that of a built-in ramp, or the ramp is empty or contains non-ASCII characters.
+    """
+    if name in BUILT_IN_RAMPS:
+        raise ValueError(f"The built-in ramp '{name}' cannot be redefined")
+    _build_ascii_lut(ascii_chars)
+    CHARACTER_RAMPS[name] = ascii_chars
+
+def register_curve(name, factory):
+    """
+    Register a named tone curve for `ASCII_Art_Studio.add_curve`. A curve registered earlier under the
+    same name is replaced, which also invalidates the translation tables and cached renders built with
+    it, but the built-in curves cannot be redefined.
+
+    Parameters:
+    - name: str, the name of the curve.
+    - factory: callable taking the curve's parameters and returning a function that maps an 8-bit
+      luminance to another 8-bit luminance.
+
+    Raises:
+    - ValueError: if the name is that of a built-in curve.
+    """
+    if name in BUILT_IN_CURVES:
+        raise ValueError(f"The built-in tone curve '{name}' cannot be redefined")
+    TONE_CURVES[name] = factory
+
+def _auto_levels(image, cutoff_percent=AUTO_LEVELS_CUTOFF_PERCENT):
+    # Finds the (low, high) luminance range of a grayscale image from its histogram, ignoring
+    # `cutoff_percent` of the pixels at each end.
+    histogram = image.histogram()[:256]
+    cutoff = sum(histogram) * cutoff_percent / 100
+    low, count = 0, 0
+    for low, pixels in enumerate(histogram):
+        count += pixels
+        if count > cutoff:
+            break
+    high, count = 255, 0
+    for high in range(255, -1, -1):
+        count += histogram[high]
+        if count > cutoff:
+            break
+    return low, high
+
+def _join_rows(ascii_bytes, width):
+    # Cuts a buffer of mapped characters into rows of `width` and returns them as newline-terminated text.
+    lines = [ascii_bytes[start:start + width] for start in range(0, len(ascii_bytes), width)]
+    if not lines:
+        return ''
+    return (b'\n'.join(lines) + b'\n').decode('ascii')
+
+class Render_Cache:
+    """
+    A least-recently-used cache of rendered ASCII art bounded both by entry count and by total size.
+    Keys are tuples whose first element identifies the source image, so every render of one source
+    can be invalidated at once.
+    """
+
+    def __init__(self, max_entries=RENDER_CACHE_MAX_ENTRIES, max_bytes=RENDER_CACHE_MAX_BYTES):
+        """
+        Initialize an empty cache.
+
+        Parameters:
+        - max_entries: int, the maximum number of renders kept; 0 disables caching.
+        - max_bytes: int, the maximum total size of the cached renders.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # Maps key -> rendered string, oldest first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Look up a cached render and mark it as most recently used.
+
+        Parameters:
+        - key: tuple, the cache key built by `ASCII_Art_Studio._render_cache_key`.
+
+        Returns:
+        - str, the cached render, or None on a miss.
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store a render, evicting least recently used entries until both limits are respected.
+        Renders larger than the whole byte budget are not cached.
+
+        Parameters:
+        - key: tuple, the cache key.
+        - value: str, the rendered ASCII art.
+        """
+        size = len(value)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.total_bytes -= len(self._entries.pop(key))
+        self._entries[key] = value
+        self.total_bytes += size
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= len(evicted)
+            self.evictions += 1
+
+    def invalidate(self, source=None):
+        """
+        Drop cached renders of one source, or every cached render when no source is given.
+
+        Parameters:
+        - source: tuple, the source identity used as the first element of the keys to drop.
+
+        Returns:
+        - int, the number of entries removed.
+        """
+        if source is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            self.total_bytes = 0
+            return removed
+        stale_keys = [key for key in self._entries if key[0] == source]
+        for key in stale_keys:
+            self.total_bytes -= len(self._entries.pop(key))
+        return len(stale_keys)
+
+    def stats(self):
+        """
+        Report the cache occupancy and its hit, miss and eviction counters.
+
+        Returns:
+        - dict, the current counters and limits.
+        """
+        return {
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+def _import_numpy():
+    # NumPy is only needed by the glyph-matching render mode, so it is imported on first use.
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("The glyph render mode requires NumPy. Install it with: pip install numpy")
+    return numpy
+
+def build_glyph_index(grid=GLYPH_FEATURE_GRID, characters=GLYPH_CHARACTERS):
+    """
+    Rasterize the characters and describe each one by the brightness of its sub-blocks. Every glyph is
+    drawn dark on light into a cell shared by all characters, and the cell is averaged down to `grid`.
+    Brightness is stretched so that the densest glyph averages 0 and the space 255, matching the range
+    of the image blocks it is compared against.
+
+    Parameters:
+    - grid: tuple, the (columns, rows) of sub-blocks per character cell.
+    - characters: str, the characters to index.
+
+    Returns:
+    - tuple, (characters, features) where `features` is a float32 NumPy array with one row per character.
+    """
+    numpy = _import_numpy()
+    try:
+        font = ImageFont.load_default(size=GLYPH_FONT_SIZE)
+    except TypeError:
+        # Older Pillow versions only provide a fixed-size bitmap font.
+        font = ImageFont.load_default()
+    boxes = [font.getbbox(character) for character in characters]
+    left = min(box[0] for box in boxes)
+    top = min(box[1] for box in boxes)
+    cell_width = max(box[2] for box in boxes) - left
+    cell_height = max(box[3] for box in boxes) - top
+
+    coverage = []
+    for character, box in zip(characters, boxes):
+        glyph = Image.new('L', (cell_width, cell_height), 0)
+        # Center the glyph horizontally in the shared cell, keeping the common baseline.
+        offset = (cell_width - (box[2] - box[0])) // 2 - box[0]
+        ImageDraw.Draw(glyph).text((offset, -top), character, fill=255, font=font)
+        coverage.append(numpy.asarray(glyph.resize(grid, Image.BOX), dtype=numpy.float32).ravel() / 255)
+    coverage = numpy.array(coverage)
+    densest = coverage.mean(axis=1).max()
+    features = 255 * (1 - numpy.minimum(coverage / densest, 1))
+    return characters, features.astype(numpy.float32)
+
+def load_glyph_index(grid=GLYPH_FEATURE_GRID, directory=GLYPH_INDEX_DIRECTORY):
+    """
+    Return the glyph feature index for `grid`, loading it from the on-disk cache or building and
+    saving it on first use. The cache is rebuilt when it was made by a different Pillow version,
+    since the rasterized fonts may differ.
+
+    Parameters:
+    - grid: tuple, the (columns, rows) of sub-blocks per character cell.
+    - directory: str, the directory holding the cached index.
+
+    Returns:
+    - tuple, (characters, features) as returned by `build_glyph_index`.
+    """
+    numpy = _import_numpy()
+    from PIL import __version__ as pillow_version
+    path = os.path.join(directory, f'glyph_index_{grid[0]}x{grid[1]}.npz')
+    try:
+        with numpy.load(path) as cached:
+            if str(cached['pillow_version']) == pillow_version and str(cached['characters']) == GLYPH_CHARACTERS:
+                return str(cached['characters']), cached['features']
+    except (OSError, KeyError, ValueError):
+        pass
+    characters, features = build_glyph_index(grid)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'wb') as index_file:
+            numpy.savez(index_file, characters=characters, features=features, pillow_version=pillow_version)
+    except OSError:
+        pass  # An unwritable cache directory only costs rebuilding the index next time
+    return characters, features
+
+class Luminance_Grid:
+    """
+    A luminance grid file opened through a memory map. The grid holds an image already resized for a
+    given width, so it can be rendered with any character ramp by a single table lookup, without
+    decoding or resizing the source image again.
+    """
+
+    def __init__(self, path):
+        """
+        Open and validate a luminance grid file.
+
+        Parameters:
+        - path: str, the file written by `ASCII_Art_Studio.save_grid`.
+
+        Raises:
+        - ValueError: if the file is not a luminance grid or is truncated.
+        """
+        with open(path, 'rb') as grid_file:
+            self._map = mmap.mmap(grid_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < LUMINANCE_GRID_HEADER.size:
+                raise ValueError(f"{path} is not a luminance grid file.")
+            (magic, version, self.width, self.height, source_width, source_height,
+             self.aspect_factor, self.source_hash) = LUMINANCE_GRID_HEADER.unpack_from(self._map)
+            if magic != LUMINANCE_GRID_MAGIC or version != LUMINANCE_GRID_VERSION:
+                raise ValueError(f"{path} is not a luminance grid file.")
+            if len(self._map) < LUMINANCE_GRID_HEADER.size + self.width * self.height:
+                raise ValueError(f"{path} is truncated.")
+        except ValueError:
+            self._map.close()
+            raise
+        self.path = path
+        self.source_size = (source_width, source_height)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the memory map."""
+        self._map.close()
+
+    def render(self, ascii_chars=ASCII_CHARS):
+        """
+        Render the stored grid as ASCII art.
+
+        Parameters:
+        - ascii_chars: str, the character ramp ordered from dark to light.
+
+        Returns:
+        - str, the ASCII art, identical to rendering the source image at the stored width with this ramp.
+        """
+        start = LUMINANCE_GRID_HEADER.size
+        luminance = self._map[start:start + self.width * self.height]
+        return _join_rows(luminance.translate(_build_ascii_lut(ascii_chars)), self.width)
+
+class Stage_Stats:
+    """
+    Cumulative timing statistics for the stages of the rendering pipeline: decoding, grayscale
+    conversion, resizing, character mapping and printing. Each stage keeps its call count, total time,
+    bytes produced, pixels processed and a histogram of its durations.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.stages = {}  # Maps stage name -> dict of cumulative counters
+
+    def record(self, stage, seconds, byte_count=0, pixel_count=0):
+        """
+        Add one measurement of a stage.
+
+        Parameters:
+        - stage: str, the name of the stage, e.g. 'decode' or 'resize'.
+        - seconds: float, the wall time the stage took.
+        - byte_count: int, the number of bytes the stage produced.
+        - pixel_count: int, the number of pixels the stage processed.
+        """
+        counters = self.stages.get(stage)
+        if counters is None:
+            counters = self.stages[stage] = {
+                'count': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'bytes': 0, 'pixels': 0,
+                'histogram': [0] * (len(STATS_HISTOGRAM_BOUNDS_MS) + 1),
+            }
+        counters['count'] += 1
+        counters['seconds'] += seconds
+        counters['max_seconds'] = max(counters['max_seconds'], seconds)
+        counters['bytes'] += byte_count
+        counters['pixels'] += pixel_count
+        counters['histogram'][bisect.bisect_left(STATS_HISTOGRAM_BOUNDS_MS, seconds * 1000)] += 1
+
+    def reset(self):
+        """Discard all recorded measurements."""
+        self.stages.clear()
+
+    def as_dict(self):
+        """
+        Export the statistics in a JSON-serializable form.
+
+        Returns:
+        - dict, the histogram bucket bounds and the counters of every stage.
+        """
+        return {
+            'histogram_bounds_ms': list(STATS_HISTOGRAM_BOUNDS_MS),
+            'stages': {stage: dict(counters, histogram=list(counters['histogram']))
+                       for stage, counters in self.stages.items()},
+        }
+
+    def format(self):
+        """
+        Format the statistics as a printable table with one line per stage and its histogram.
+
+        Returns:
+        - str, the formatted statistics.
+        """
+        if not self.stages:
+            return "No stage timings recorded yet."
+        bucket_labels = [f"<={bound}ms" for bound in STATS_HISTOGRAM_BOUNDS_MS] + [f">{STATS_HISTOGRAM_BOUNDS_MS[-1]}ms"]
+        lines = [f"{'stage':<12}{'count':>7}{'total ms':>12}{'mean ms':>10}{'max ms':>10}{'bytes':>14}{'pixels':>14}"]
+        for stage, counters in self.stages.items():
+            mean_ms = counters['seconds'] / counters['count'] * 1000
+            lines.append(
+                f"{stage:<12}{counters['count']:>7}{counters['seconds'] * 1000:>12.2f}{mean_ms:>10.2f}"
+                f"{counters['max_seconds'] * 1000:>10.2f}{counters['bytes']:>14}{counters['pixels']:>14}"
+            )
+            histogram = ', '.join(f"{label}: {count}" for label, count in zip(bucket_labels, counters['histogram']) if count)
+            lines.append(f"{'':<12}{histogram}")
+        return "\n".join(lines)
+
 class ASCII_Art_Studio:
     """
     A class to handle the conversion of images into ASCII art. It supports loading images,
     converting them to grayscale, resizing for appropriate aspect ratio in a text display,
     and rendering them as ASCII characters.
     """
+
+    # Maps each selectable rendering engine to the method implementing it. 'reference' is the original
+    # per-pixel conversion and is kept as the ground truth the faster engines must reproduce exactly.
+    RENDER_ENGINES = {
+        'reference': '_convert_to_ascii_reference',
+        'lut': '_convert_to_ascii_lut',
+    }
     
-    def __init__(self):
+    def __init__(self, engine=DEFAULT_RENDER_ENGINE, lazy=False, render_cache=None, instrument=False, pyramid=False,
+                 color=False):
         """
         Initialize the ASCII Art Studio without any image pre-loaded. This sets up
         the internal state for future operations such as loading and rendering.
+
+        Parameters:
+        - engine: str, the name of the rendering engine to use, one of `RENDER_ENGINES`.
+        - lazy: bool, when True `load` only reads the image header and decoding is deferred
+          until `render` knows the target width.
+        - render_cache: Render_Cache, an optional cache to use, for example one shared between studios.
+          A private cache with the default limits is created when omitted.
+        - instrument: bool, when True per-stage timings are recorded into `stats`.
+        - pyramid: bool, when True renders resample from a pyramid of successively halved copies of the
+          loaded image, built lazily, instead of from the full-resolution image.
+        - color: bool, when True `load` also keeps an RGB copy of the image for `render_color`.
         """
+        if engine not in self.RENDER_ENGINES:
+            raise ValueError(f"Unknown render engine '{engine}'. Choose from: {', '.join(self.RENDER_ENGINES)}")
         # Initializes the object without an image. `current_image` will hold the image being processed,
         # while `filename` stores the name of the file for reference.
         self.current_image = None  # Stores the current image as a PIL Image object
         self.filename = ''         # Stores the filename of the current image
+        self.engine = engine       # Name of the engine used by `_convert_to_ascii`
+        # The tone pipeline: the character ramp, the tone curves applied in order as (name, parameters)
+        # pairs, and whether auto-levels stretches each resized image first. All of it is folded into
+        # one translation table, cached for the settings and levels it was built for.
+        self.ramp = 'default'
+        self.ascii_chars = ASCII_CHARS
+        self.curves = []
+        self.auto_levels = False
+        self._ascii_lut = None     # Lazily built grayscale-to-character translation table
+        self._ascii_lut_key = None
+        self.lazy = lazy           # Whether `load` defers decoding until render time
+        # State used by lazy loading: the size read from the header, whether the pixel data is still
+        # undecoded, and the reduced-resolution decode kept around for subsequent renders.
+        self._deferred_size = None
+        self._deferred = False
+        self._draft_image = None
+        # Cache of finished renders and the identity of the loaded file used in its keys.
+        self.render_cache = render_cache if render_cache is not None else Render_Cache()
+        self._source_key = None
+        self.frame_count = 1       # Number of frames in the loaded file; greater than 1 for animations
+        # Per-stage timing statistics, or None when instrumentation is disabled. Every hook only checks
+        # this attribute, so disabled instrumentation costs a single comparison per stage.
+        self.stats = Stage_Stats() if instrument else None
+        self.pyramid = pyramid     # Whether `_resize_image` resamples from the mip pyramid
+        self._pyramid_levels = None  # The levels built so far, from the full image down to the smallest
+        self.color = color         # Whether `load` keeps an RGB copy next to the grayscale image
+        self.color_image = None    # The RGB copy used by `render_color`
+        self.last_color_stats = None  # Output size figures of the most recent `render_color`
+        self.glyph_index_directory = GLYPH_INDEX_DIRECTORY  # Where `render_glyph` caches its glyph index
+        self._glyph_index = None   # The (characters, features, squared norms) used by `render_glyph`
     
     def load(self, filename):
         """
@@ -55,11 +631,41 @@ class ASCII_Art_Studio:
         """
         # Loads and converts an image to grayscale. This is the first step in preparing the image
         # for conversion to ASCII art. Grayscale simplifies the image to a single brightness value per pixel.
+        # In lazy mode only the header is read here; `Image.open` does not decode pixel data.
         try:
             with Image.open(filename) as img:
-                self.current_image = img.convert('L')
+                if self.lazy:
+                    self.current_image = None
+                    self._deferred_size = img.size
+                    self._deferred = True
+                    self.color_image = None
+                else:
+                    stats = self.stats
+                    if stats is not None:
+                        start_time = time.perf_counter()
+                    img.load()
+                    if stats is not None:
+                        decoded_time = time.perf_counter()
+                        pixel_count = img.width * img.height
+                        stats.record('decode', decoded_time - start_time, pixel_count * len(img.getbands()), pixel_count)
+                    self.current_image = img.convert('L')
+                    if stats is not None:
+                        stats.record('grayscale', time.perf_counter() - decoded_time, pixel_count, pixel_count)
+                    self.color_image = img.convert('RGB') if self.color else None
+                    self._deferred_size = None
+                    self._deferred = False
+                self._draft_image = None
+                self._pyramid_levels = None
+                # Counting frames scans the whole file, so it is only done for files that are animated.
+                self.frame_count = img.n_frames if getattr(img, 'is_animated', False) else 1
+                # Renders of the image being replaced are no longer useful to this studio. Reloading an
+                # unchanged file, e.g. after `release`, keeps them since their key is still valid.
+                source_key = self._identify_source(filename)
+                if self._source_key is not None and self._source_key != source_key:
+                    self.render_cache.invalidate(self._source_key)
+                self._source_key = source_key
                 self.filename = filename
-                return "Image loaded successfully."
+                return LOAD_SUCCESS_MESSAGE
         except FileNotFoundError:
             return "The specified file was not found."
         except IOError as e:
@@ -75,16 +681,133 @@ class ASCII_Art_Studio:
         Returns:
         - str, information about the current image or an indicator that no image is loaded.
         """
-        if self.current_image:
-            # Return formatted information about the image
-            return f"Filename: {self.filename}\nSize: {self.current_image.size}"
+        if self.has_image():
+            # Return formatted information about the image. In lazy mode the size comes from the header.
+            details = f"Filename: {self.filename}\nSize: {self._source_size()}"
+            if self.frame_count > 1:
+                details += f"\nFrames: {self.frame_count}"
+            return details
         return "No image loaded"
+
+    def _identify_source(self, filename):
+        # Identifies a file by absolute path, modification time and size so that an overwritten file
+        # never hits renders of its previous content. Sources that are not paths are not cached.
+        if not isinstance(filename, (str, os.PathLike)):
+            return None
+        file_stat = os.stat(filename)
+        return (os.path.abspath(filename), file_stat.st_mtime_ns, file_stat.st_size)
+
+    def _render_cache_key(self, new_width):
+        # Everything that changes the rendered text: the source, the width, the aspect correction, the
+        # character ramp and tone curves, and whether the image was resampled from a reduced copy (lazy loading or the pyramid).
+        if self._source_key is None:
+            return None
+        return (self._source_key, new_width, FONT_ADJUSTMENT_FACTOR_FOR_DISPLAY_ASPECT_RATIO, self.ascii_chars,
+                self._curves_key(), self.auto_levels, self.lazy, self.pyramid)
+
+    def _curves_key(self):
+        # Identifies the tone curves by name, parameters and factory, so that tables and renders built
+        # with a curve are not reused once `register_curve` replaces it.
+        return tuple((name, parameters, TONE_CURVES.get(name)) for name, parameters in self.curves)
+
+    def has_image(self):
+        """
+        Check whether an image is loaded. In lazy mode an image whose header has been read counts as loaded.
+
+        Returns:
+        - bool, True when there is an image to render.
+        """
+        return self.current_image is not None or self._deferred
+
+    def decoded_bytes(self):
+        """
+        Report the memory held by decoded pixel data: the grayscale image, its RGB copy, the reduced
+        pyramid levels and the lazily decoded draft.
+
+        Returns:
+        - int, the number of bytes of pixel data held by the studio.
+        """
+        images = [self.current_image, self.color_image, self._draft_image]
+        if self._pyramid_levels:
+            images += self._pyramid_levels[1:]  # The first level is `current_image` itself
+        return sum(len(image.getbands()) * image.width * image.height for image in images if image is not None)
+
+    def release(self):
+        """
+        Drop the decoded pixel data of the loaded image while remembering its filename, so that
+        `load(self.filename)` can restore it later. Cached renders of the image are kept.
+
+        Returns:
+        - int, the number of bytes of pixel data released.
+        """
+        released = self.decoded_bytes()
+        self.current_image = None
+        self.color_image = None
+        self._draft_image = None
+        self._pyramid_levels = None
+        self._deferred = False
+        return released
+
+    def _source_size(self):
+        # Returns the original (width, height) of the loaded image without forcing a decode.
+        if self.current_image is not None:
+            return self.current_image.size
+        return self._deferred_size
     
     def _get_ascii_char(self, gray_value):
-        # Maps a grayscale value to an ASCII character from the defined `ASCII_CHARS` string.
+        # Maps a grayscale value to an ASCII character from the selected character ramp.
         # The mapping is based on the relative brightness of the grayscale value.
-        index = int(gray_value / GRAYSCALE_MAX_VALUE * (len(ASCII_CHARS) - 1))
-        return ASCII_CHARS[index]
+        index = int(gray_value / GRAYSCALE_MAX_VALUE * (len(self.ascii_chars) - 1))
+        return self.ascii_chars[index]
+
+    def set_ramp(self, name):
+        """
+        Select a named character ramp from `CHARACTER_RAMPS`.
+
+        Parameters:
+        - name: str, the name of the ramp.
+
+        Raises:
+        - ValueError: if no ramp has that name.
+        """
+        if name not in CHARACTER_RAMPS:
+            raise ValueError(f"Unknown character ramp '{name}'. Available ramps: {', '.join(CHARACTER_RAMPS)}")
+        self.ramp = name
+        self.ascii_chars = CHARACTER_RAMPS[name]
+
+    def add_curve(self, name, *parameters):
+        """
+        Append a named tone curve from `TONE_CURVES` to the tone pipeline.
+
+        Parameters:
+        - name: str, the name of the curve.
+        - parameters: float, the parameters of the curve, e.g. the gamma value.
+
+        Raises:
+        - ValueError: if no curve has that name or the parameters do not fit it.
+        """
+        if name not in TONE_CURVES:
+            raise ValueError(f"Unknown tone curve '{name}'. Available curves: {', '.join(TONE_CURVES)}")
+        try:
+            TONE_CURVES[name](*parameters)
+        except TypeError:
+            raise ValueError(f"Wrong number of parameters for the tone curve '{name}'.")
+        self.curves.append((name, tuple(parameters)))
+
+    def clear_curves(self):
+        """Remove every tone curve and turn auto-levels off."""
+        self.curves = []
+        self.auto_levels = False
+
+    def _measure_levels(self, image):
+        # Returns the auto-levels range of a resized image, or None when auto-levels is off.
+        return _auto_levels(image) if self.auto_levels else None
+
+    def _tone_functions(self, levels=None):
+        # Returns the luminance functions of the tone pipeline in the order they apply.
+        functions = [_levels_curve(*levels)] if levels is not None else []
+        functions.extend(TONE_CURVES[name](*parameters) for name, parameters in self.curves)
+        return functions
 
     def _resize_image(self, new_width=ASCII_ART_WIDTH_IN_CHARACTERS):
         """
@@ -101,19 +824,151 @@ class ASCII_Art_Studio:
         Returns:
         - Image: a PIL Image object that has been resized to the new dimensions.
         """
-        original_width, original_height = self.current_image.size
+        return self._resample(self._target_size(new_width))
+
+    def _resample(self, size, resample=None):
+        # Resizes the loaded image to `size`, starting from the lazily decoded draft or the pyramid level
+        # when those are in use, and from the full-resolution image otherwise. `resample` selects the
+        # Pillow filter; None keeps Pillow's default, which `_resize_image` has always used.
+        source = self._resample_source(size)
+        stats = self.stats
+        if stats is None:
+            return source.resize(size, resample)
+        start_time = time.perf_counter()
+        resized = source.resize(size, resample)
+        stats.record('resize', time.perf_counter() - start_time, size[0] * size[1], source.width * source.height)
+        return resized
+
+    def _resample_source(self, size):
+        # Returns the grayscale image a resize to `size` starts from: the lazily decoded draft, the
+        # pyramid level, or the full-resolution image.
+        if self.current_image is None and self._deferred:
+            return self._decode_for_size(size)
+        if self.pyramid:
+            return self._pyramid_level(size)
+        return self.current_image
+
+    def _target_size(self, new_width, source_size=None):
+        # Computes the (width, height) of the resized image for a render `new_width` characters wide,
+        # of the loaded image or of an image of `source_size`.
+        original_width, original_height = source_size or self._source_size()
         aspect_ratio = original_height / original_width
         new_height = int(new_width * aspect_ratio * FONT_ADJUSTMENT_FACTOR_FOR_DISPLAY_ASPECT_RATIO)
-        return self.current_image.resize((new_width, new_height))
+        return new_width, new_height
+
+    def _pyramid_level(self, size):
+        """
+        Return the smallest level of the image pyramid that is still `PYRAMID_OVERSAMPLING` times as large
+        as `size`, or the full image when no level is.
+        Level 0 is the loaded image and each further level halves both dimensions with a 2x2 box filter.
+        Levels are only built when a render first needs them and are kept until the next `load`, so
+        repeated renders at different widths cost roughly in proportion to their output size.
+
+        Resampling from a level instead of the full image gives the same dimensions. Because each level
+        is a box-filtered average, the luminance stays within `PYRAMID_MAX_MEAN_ERROR` gray levels of
+        the direct resize on average.
+
+        Parameters:
+        - size: tuple, the (width, height) the image is about to be resized to.
+
+        Returns:
+        - Image: the chosen grayscale pyramid level.
+        """
+        target_width = max(size[0], 1) * PYRAMID_OVERSAMPLING
+        target_height = max(size[1], 1) * PYRAMID_OVERSAMPLING
+        if self._pyramid_levels is None:
+            self._pyramid_levels = [self.current_image]
+        levels = self._pyramid_levels
+        while levels[-1].width // 2 >= target_width and levels[-1].height // 2 >= target_height:
+            levels.append(levels[-1].reduce(2))
+        for level in reversed(levels):
+            if level.width >= target_width and level.height >= target_height:
+                return level
+        return levels[0]
+
+    def _decode_for_size(self, size):
+        """
+        Decode the lazily loaded image at the smallest resolution that still covers the requested size.
+        JPEG files are reduced in the DCT domain through `Image.draft`, so only a fraction of the pixel
+        data is ever produced. Other formats are decoded fully and then shrunk with `Image.reduce` so that
+        the grayscale copy kept for later renders stays small.
+
+        The reduced decode is cached and reused for any later render that needs no more resolution.
+
+        Parameters:
+        - size: tuple, the (width, height) the image is about to be resized to.
+
+        Returns:
+        - Image: a grayscale PIL Image object at least as large as `size`.
+        """
+        target_width, target_height = max(size[0], 1), max(size[1], 1)
+        draft = self._draft_image
+        if draft is not None and draft.width >= target_width and draft.height >= target_height:
+            return draft
+        stats = self.stats
+        if stats is not None:
+            start_time = time.perf_counter()
+        with Image.open(self.filename) as img:
+            img.draft('L', (target_width, target_height))
+            draft = img.convert('L')
+        factor = min(draft.width // target_width, draft.height // target_height)
+        if factor > 1:
+            draft = draft.reduce(factor)
+        if stats is not None:
+            stats.record('decode', time.perf_counter() - start_time, draft.width * draft.height, draft.width * draft.height)
+        self._draft_image = draft
+        return draft
     
-    def _convert_to_ascii(self, image):
-        # Converts the resized grayscale image to ASCII art, line by line, by mapping each pixel's
-        # brightness to an ASCII character.
+    def _get_ascii_lut(self, levels=None):
+        # Returns the translation table of the whole tone pipeline: the auto-levels range, the tone
+        # curves and the character ramp composed into one 256-entry table, rebuilt only when they change.
+        key = (self.ascii_chars, self._curves_key(), levels)
+        if self._ascii_lut is None or key != self._ascii_lut_key:
+            functions = self._tone_functions(levels)
+            tone_table = bytearray(range(256))
+            for function in functions:
+                tone_table = bytearray(function(value) for value in tone_table)
+            self._ascii_lut = bytes(tone_table).translate(_build_ascii_lut(self.ascii_chars))
+            self._ascii_lut_key = key
+        return self._ascii_lut
+
+    def _convert_to_ascii(self, image, levels=None):
+        # Converts the resized grayscale image to ASCII art using the selected rendering engine. Callers
+        # converting a band of a larger image pass the auto-levels range measured on the whole image.
+        convert = getattr(self, self.RENDER_ENGINES[self.engine])
+        if levels is None:
+            levels = self._measure_levels(image)
+        stats = self.stats
+        if stats is None:
+            return convert(image, levels)
+        start_time = time.perf_counter()
+        ascii_art = convert(image, levels)
+        stats.record('map', time.perf_counter() - start_time, len(ascii_art), image.width * image.height)
+        return ascii_art
+
+    def _convert_to_ascii_reference(self, image, levels=None):
+        # Converts the resized grayscale image to ASCII art, line by line, by passing each pixel's
+        # brightness through the tone curves and mapping the result to an ASCII character.
+        functions = self._tone_functions(levels)
+
+        def apply_tone(gray_value):
+            for function in functions:
+                gray_value = function(gray_value)
+            return gray_value
+
         ascii_art = []
         for y in range(image.height):
-            line = [self._get_ascii_char(image.getpixel((x, y))) for x in range(image.width)]
+            line = [self._get_ascii_char(apply_tone(image.getpixel((x, y)))) for x in range(image.width)]
             ascii_art.append("".join(line) + '\n')  # Ensure each line is terminated with a newline character '\n'
         return ''.join(ascii_art)
+
+    def _convert_to_ascii_lut(self, image, levels=None):
+        # Converts the resized grayscale image to ASCII art in bulk. The raw 8-bit pixel buffer is mapped
+        # through the precomputed table of the whole tone pipeline in a single `bytes.translate` call
+        # and then cut into lines.
+        if image.mode != 'L':
+            image = image.convert('L')
+        return _join_rows(image.tobytes().translate(self._get_ascii_lut(levels)), image.width)
     
     def render(self, new_width=ASCII_ART_WIDTH_IN_CHARACTERS):
         """
@@ -126,10 +981,252 @@ class ASCII_Art_Studio:
         Returns:
         - str, the ASCII art of the current image or an error message if no image is loaded.
         """
-        if self.current_image is None:
+        if not self.has_image():
             return "No image loaded to render."
         
+        # Serve repeated renders of the same source and settings from the cache.
+        cache_key = self._render_cache_key(new_width)
+        if cache_key is not None:
+            cached = self.render_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         # Resize the image for text representation and convert it to ASCII art.
         ascii_image = self._resize_image(new_width)
         # Convert the resized image to ASCII art and return it
-        return self._convert_to_ascii(ascii_image)
\ No newline at end of file
+        ascii_art = self._convert_to_ascii(ascii_image)
+        if cache_key is not None:
+            self.render_cache.put(cache_key, ascii_art)
+        return ascii_art
+
+    def render_iter(self, new_width=ASCII_ART_WIDTH_IN_CHARACTERS, band_rows=RENDER_BAND_ROWS):
+        """
+        Render the current image as ASCII art incrementally, one horizontal band of rows at a time.
+        Only the resized image and a single band of text are held in memory, which keeps very wide
+        renders from building several full copies of the output.
+
+        Parameters:
+        - new_width: int, an optional width for the ASCII art representation.
+        - band_rows: int, the number of text rows converted and yielded at a time.
+
+        Yields:
+        - str, consecutive bands of the ASCII art, each ending with a newline.
+
+        Raises:
+        - ValueError: if no image is loaded.
+        """
+        if not self.has_image():
+            raise ValueError("No image loaded to render.")
+
+        # A render that is already cached is in memory anyway, so it is yielded as a whole.
+        cache_key = self._render_cache_key(new_width)
+        if cache_key is not None:
+            cached = self.render_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        ascii_image = self._resize_image(new_width)
+        levels = self._measure_levels(ascii_image)  # Auto-levels applies to the image as a whole, not per band
+        for top in range(0, ascii_image.height, band_rows):
+            bottom = min(top + band_rows, ascii_image.height)
+            yield self._convert_to_ascii(ascii_image.crop((0, top, ascii_image.width, bottom)), levels)
+
+    def render_to(self, stream, new_width=ASCII_ART_WIDTH_IN_CHARACTERS, band_rows=RENDER_BAND_ROWS):
+        """
+        Render the current image as ASCII art directly into a binary file-like object, band by band.
+
+        Parameters:
+        - stream: a binary file-like object with a `write` method, such as `sys.stdout.buffer`.
+        - new_width: int, an optional width for the ASCII art representation.
+        - band_rows: int, the number of text rows converted and written at a time.
+
+        Returns:
+        - int, the number of bytes written.
+
+        Raises:
+        - ValueError: if no image is loaded.
+        """
+        bytes_written = 0
+        write_seconds = 0.0
+        for band in self.render_iter(new_width, band_rows):
+            data = band.encode('ascii')
+            if self.stats is None:
+                stream.write(data)
+            else:
+                start_time = time.perf_counter()
+                stream.write(data)
+                write_seconds += time.perf_counter() - start_time
+            bytes_written += len(data)
+        if self.stats is not None:
+            self.stats.record('print', write_seconds, bytes_written)
+        return bytes_written
+
+    def render_frames(self, new_width=ASCII_ART_WIDTH_IN_CHARACTERS):
+        """
+        Render every frame of the loaded file, such as an animated GIF, as ASCII art. Frames are
+        decoded one at a time from the file, so only the current frame is held in memory.
+
+        Parameters:
+        - new_width: int, an optional width for the ASCII art representation.
+
+        Yields:
+        - tuple, (ascii_art, duration_ms) for each frame in order.
+
+        Raises:
+        - ValueError: if no image is loaded.
+        """
+        if not self.has_image():
+            raise ValueError("No image loaded to animate.")
+        target_size = self._target_size(new_width)
+        with Image.open(self.filename) as img:
+            for frame in ImageSequence.Iterator(img):
+                duration = frame.info.get('duration') or DEFAULT_FRAME_DURATION_MS
+                yield self._convert_to_ascii(frame.convert('L').resize(target_size)), duration
+
+    def _color_source(self):
+        # Returns the RGB copy of the loaded image, decoding it from the file when `load` did not keep one.
+        if self.color_image is None:
+            with Image.open(self.filename) as img:
+                self.color_image = img.convert('RGB')
+        return self.color_image
+
+    def _quantized_colors(self, size, palette):
+        # Resizes the RGB image and quantizes the colors of all cells at once with Pillow lookup tables.
+        # Returns the raw color codes: one byte per cell for 'color256', three bytes per cell for 'truecolor'.
+        rgb = self._color_source().resize(size)
+        if palette == 'truecolor':
+            step = COLOR_QUANTIZATION_STEP
+            channel_table = [min(255, value // step * step + step // 2) for value in range(256)]
+            return rgb.point(channel_table * 3).tobytes()
+        # The xterm 256-color cube: index = 16 + 36 * red + 6 * green + blue, each component in 0..5.
+        cube_levels = [round(value * 5 / 255) for value in range(256)]
+        red, green, blue = rgb.point(
+            [16 + 36 * level for level in cube_levels] + [6 * level for level in cube_levels] + cube_levels
+        ).split()
+        return ImageChops.add(ImageChops.add(red, green), blue).tobytes()
+
+    def render_color(self, new_width=ASCII_ART_WIDTH_IN_CHARACTERS, palette='truecolor'):
+        """
+        Render the current image as colored ASCII art using ANSI escape sequences. The characters are
+        the same as in `render`; each cell is colored with the quantized color of the image at that spot.
+        Consecutive cells of the same color share a single escape sequence, which keeps the output
+        small enough to stream over slow connections. The resulting size is stored in `last_color_stats`.
+
+        Parameters:
+        - new_width: int, an optional width for the ASCII art representation.
+        - palette: str, 'truecolor' for 24-bit colors or 'color256' for the xterm 256-color palette.
+
+        Returns:
+        - str, the colored ASCII art or an error message if no image is loaded.
+        """
+        if palette not in COLOR_PALETTES:
+            raise ValueError(f"Unknown color palette '{palette}'. Choose from: {', '.join(COLOR_PALETTES)}")
+        if not self.has_image():
+            return "No image loaded to render."
+
+        ascii_image = self._resize_image(new_width)
+        width, height = ascii_image.size
+        ascii_bytes = ascii_image.tobytes().translate(self._get_ascii_lut(self._measure_levels(ascii_image)))
+        color_bytes = self._quantized_colors(ascii_image.size, palette)
+        code_size = 3 if palette == 'truecolor' else 1
+        run_pattern = _COLOR_RUN_PATTERNS[palette]
+
+        escapes = {}  # Escape sequence of every color code seen so far
+        output = []
+        runs = 0
+        for row in range(height):
+            row_chars = ascii_bytes[row * width:(row + 1) * width]
+            row_colors = color_bytes[row * width * code_size:(row + 1) * width * code_size]
+            for run in run_pattern.finditer(row_colors):
+                code = run.group(1)
+                escape = escapes.get(code)
+                if escape is None:
+                    if palette == 'truecolor':
+                        escape = b'\x1b[38;2;%d;%d;%dm' % (code[0], code[1], code[2])
+                    else:
+                        escape = b'\x1b[38;5;%dm' % code[0]
+                    escapes[code] = escape
+                output.append(escape)
+                output.append(row_chars[run.start() // code_size:run.end() // code_size])
+                runs += 1
+            output.append(ANSI_RESET + b'\n')
+
+        colored_art = b''.join(output)
+        cells = width * height
+        self.last_color_stats = {
+            'cells': cells,
+            'runs': runs,
+            'bytes': len(colored_art),
+            'bytes_per_cell': len(colored_art) / cells if cells else 0.0,
+        }
+        return colored_art.decode('ascii')
+
+    def render_glyph(self, new_width=ASCII_ART_WIDTH_IN_CHARACTERS):
+        """
+        Render the current image as ASCII art by matching the shape of each character cell instead of
+        only its brightness, which preserves edges and lines. Every cell of the image is split into a
+        grid of sub-blocks and the printable character whose rasterized glyph is nearest to those
+        sub-blocks is chosen. All cells are matched at once with a single matrix product.
+
+        Parameters:
+        - new_width: int, an optional width for the ASCII art representation.
+
+        Returns:
+        - str, the ASCII art of the current image or an error message if no image is loaded.
+        """
+        if not self.has_image():
+            return "No image loaded to render."
+        numpy = _import_numpy()
+        if self._glyph_index is None:
+            characters, features = load_glyph_index(GLYPH_FEATURE_GRID, self.glyph_index_directory)
+            self._glyph_index = (
+                numpy.frombuffer(characters.encode('ascii'), dtype=numpy.uint8),
+                features,
+                (features ** 2).sum(axis=1),
+            )
+        character_codes, features, squared_norms = self._glyph_index
+
+        width, height = self._target_size(new_width)
+        grid_columns, grid_rows = GLYPH_FEATURE_GRID
+        # Sub-blocks are area averages, like the glyph features, so the cheap box filter is the right one.
+        blocks = numpy.asarray(self._resample((width * grid_columns, height * grid_rows), Image.BOX),
+                               dtype=numpy.float32)
+        # Regroup the pixels so that each row holds the sub-blocks of one character cell.
+        cells = blocks.reshape(height, grid_rows, width, grid_columns).transpose(0, 2, 1, 3).reshape(height * width, -1)
+        # argmin of |cell - glyph|^2 over the glyphs; the |cell|^2 term is the same for every glyph.
+        nearest = numpy.argmin(squared_norms - 2 * cells @ features.T, axis=1)
+
+        grid = numpy.empty((height, width + 1), dtype=numpy.uint8)
+        grid[:, :width] = character_codes[nearest].reshape(height, width)
+        grid[:, width] = ord('\n')
+        return grid.tobytes().decode('ascii')
+
+    def save_grid(self, path, new_width=ASCII_ART_WIDTH_IN_CHARACTERS):
+        """
+        Save the current image, resized for `new_width`, as a compact luminance grid file that
+        `Luminance_Grid` can render with any character ramp without touching the source image again.
+
+        Parameters:
+        - path: str, the file to write, conventionally with the `LUMINANCE_GRID_EXTENSION` extension.
+        - new_width: int, an optional width for the ASCII art representation.
+
+        Returns:
+        - str, a success message or an error message if no image is loaded.
+        """
+        if not self.has_image():
+            return "No image loaded to save."
+        ascii_image = self._resize_image(new_width)
+        source_hash = hashlib.sha256()
+        with open(self.filename, 'rb') as source_file:
+            for chunk in iter(lambda: source_file.read(1024 * 1024), b''):
+                source_hash.update(chunk)
+        source_width, source_height = self._source_size()
+        header = LUMINANCE_GRID_HEADER.pack(
+            LUMINANCE_GRID_MAGIC, LUMINANCE_GRID_VERSION, ascii_image.width, ascii_image.height,
+            source_width, source_height, FONT_ADJUSTMENT_FACTOR_FOR_DISPLAY_ASPECT_RATIO, source_hash.digest(),
+        )
+        with open(path, 'wb') as grid_file:
+            grid_file.write(header)
+            grid_file.write(ascii_image.tobytes())
+        return "Luminance grid saved successfully."
@@ -0,0 +1,179 @@
+# Batch_Renderer.py
+
+# glob expands the file patterns given on the command line, os builds the output paths, and the
+# process pool from concurrent.futures spreads the renders over all available cores.
+import glob
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from ASCII_Art_Studio import (ASCII_ART_WIDTH_IN_CHARACTERS, LOAD_SUCCESS_MESSAGE, LUMINANCE_GRID_EXTENSION,
+                              ASCII_Art_Studio)
+
+# How many renders may be queued per worker process before the batch waits for results.
+# This bounds memory use when a pattern matches thousands of files.
+IN_FLIGHT_PER_WORKER = 2
+
+# The output formats of a batch: ASCII art text files, or luminance grids that can be rendered later
+# with any character ramp without decoding the images again.
+OUTPUT_EXTENSIONS = {'text': '.txt', 'grid': LUMINANCE_GRID_EXTENSION}
+
+def _render_file(filename, width, output_path, output_format='text'):
+    """
+    Render one image file and write its ASCII art to `output_path`. This runs inside a worker process.
+
+    Parameters:
+    - filename: str, the image to render.
+    - width: int, the width of the ASCII art in characters.
+    - output_path: str, the file to write.
+    - output_format: str, 'text' for ASCII art or 'grid' for a luminance grid file.
+
+    Returns:
+    - tuple, (filename, output_path, error) where `error` is None on success or the error message.
+    """
+    studio = ASCII_Art_Studio()
+    message = studio.load(filename)
+    if message != LOAD_SUCCESS_MESSAGE:
+        return filename, None, message
+    try:
+        if output_format == 'grid':
+            studio.save_grid(output_path, new_width=width)
+            return filename, output_path, None
+        ascii_art = studio.render(new_width=width)
+        with open(output_path, 'w', encoding='ascii') as output_file:
+            output_file.write(ascii_art)
+    except Exception as e:
+        return filename, None, f"An unexpected error occurred: {e}."
+    return filename, output_path, None
+
+class Batch_Renderer:
+    """
+    Renders every file matching a glob pattern into a directory of text files using a pool of
+    worker processes. Results are reported as soon as each file finishes, and per-file errors are
+    collected into the summary instead of stopping the batch.
+    """
+
+    def __init__(self, workers=None, max_in_flight=None, output_format='text'):
+        """
+        Initialize the batch renderer.
+
+        Parameters:
+        - workers: int, the number of worker processes; defaults to the number of CPUs.
+        - max_in_flight: int, the maximum number of files submitted but not yet finished;
+          defaults to `IN_FLIGHT_PER_WORKER` per worker.
+        - output_format: str, 'text' to write ASCII art or 'grid' to write luminance grid files.
+
+        Raises:
+        - ValueError: if the output format is unknown.
+        """
+        if output_format not in OUTPUT_EXTENSIONS:
+            raise ValueError(f"Unknown output format '{output_format}'. Available formats: {', '.join(OUTPUT_EXTENSIONS)}")
+        self.output_format = output_format
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or self.workers * IN_FLIGHT_PER_WORKER
+
+    def _glob_root(self, pattern):
+        # Returns the directory made of the leading components of `pattern` that contain no wildcards.
+        root_parts = []
+        for part in os.path.normpath(pattern).split(os.sep)[:-1]:
+            if glob.has_magic(part):
+                break
+            root_parts.append(part or os.sep)
+        return os.path.join(*root_parts) if root_parts else '.'
+
+    def _output_path(self, filename, output_dir, root='.'):
+        # Mirrors the path of the file below the glob root, so that files sharing a name in different
+        # subdirectories matched by '**' do not collide. The original extension is kept so that e.g.
+        # 'a.jpg' and 'a.png' do not collide either.
+        relative_path = os.path.relpath(filename, root)
+        if relative_path.startswith(os.pardir + os.sep):
+            relative_path = os.path.basename(filename)
+        return os.path.join(output_dir, relative_path + OUTPUT_EXTENSIONS[self.output_format])
+
+    def run(self, pattern, width=ASCII_ART_WIDTH_IN_CHARACTERS, output_dir='.', on_result=None):
+        """
+        Render all files matching `pattern` and write one output file per image into `output_dir`.
+        Files found in subdirectories of the pattern's fixed leading directory are written to the same
+        subdirectories of `output_dir`.
+
+        Parameters:
+        - pattern: str, a glob pattern such as 'photos/*.jpg'; '**' matches subdirectories.
+        - width: int, the width of the ASCII art in characters.
+        - output_dir: str, the directory receiving the output files; created if missing.
+        - on_result: callable, optional, called with (filename, output_path, error) as each file finishes.
+
+        Returns:
+        - dict, a summary with the matched, rendered and failed counts, the list of (filename, error)
+          failures and the elapsed time in seconds.
+        """
+        filenames = sorted(name for name in glob.glob(pattern, recursive=True) if os.path.isfile(name))
+        os.makedirs(output_dir, exist_ok=True)
+        root = self._glob_root(pattern)
+        summary = {'matched': len(filenames), 'rendered': 0, 'failed': 0, 'errors': [], 'elapsed': 0.0}
+        start_time = time.perf_counter()
+
+        def collect(finished):
+            for future in finished:
+                filename, output_path, error = future.result()
+                if error is None:
+                    summary['rendered'] += 1
+                else:
+                    summary['failed'] += 1
+                    summary['errors'].append((filename, error))
+                if on_result is not None:
+                    on_result(filename, output_path, error)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            in_flight = set()
+            for filename in filenames:
+                # Wait for at least one render to finish before queueing more than the allowed amount.
+                if len(in_flight) >= self.max_in_flight:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                output_path = self._output_path(filename, output_dir, root)
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                in_flight.add(executor.submit(_render_file, filename, width, output_path, self.output_format))
+            while in_flight:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(finished)
+
+        summary['elapsed'] = time.perf_counter() - start_time
+        return summary
+
+def format_summary(summary):
+    """
+    Format a batch summary as printable text.
+
+    Parameters:
+    - summary: dict, the summary returned by `Batch_Renderer.run`.
+
+    Returns:
+    - str, the summary followed by one line per failed file.
+    """
+    lines = [
+        f"Batch finished in {summary['elapsed']:.2f}s: {summary['rendered']} rendered, "
+        f"{summary['failed']} failed, {summary['matched']} matched."
+    ]
+    for filename, error in summary['errors']:
+        lines.append(f"  {filename}: {error}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render every image matching a glob pattern to ASCII art text files.")
+    parser.add_argument('pattern', help="glob pattern of the images to render, e.g. 'photos/*.jpg'")
+    parser.add_argument('width', type=int, nargs='?', default=ASCII_ART_WIDTH_IN_CHARACTERS, help="width in characters")
+    parser.add_argument('output_dir', nargs='?', default='.', help="directory receiving the output files")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes (default: all CPUs)")
+    parser.add_argument('--grid', action='store_true',
+                        help=f"write {LUMINANCE_GRID_EXTENSION} luminance grids instead of .txt files")
+    arguments = parser.parse_args()
+
+    def print_result(filename, output_path, error):
+        print(f"{filename} -> {output_path}" if error is None else f"{filename}: {error}", flush=True)
+
+    batch_summary = Batch_Renderer(workers=arguments.workers, output_format='grid' if arguments.grid else 'text').run(
+        arguments.pattern, arguments.width, arguments.output_dir, on_result=print_result)
+    print(format_summary(batch_summary))
+    raise SystemExit(1 if batch_summary['failed'] else 0)
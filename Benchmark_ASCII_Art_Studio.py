@@ -0,0 +1,288 @@
+# Benchmark_ASCII_Art_Studio.py
+
+# Times each stage of the ASCII art pipeline (load, _resize_image, _convert_to_ascii and render) over the
+# sample images and synthetic large images, and compares the results against a stored baseline.
+#
+# Usage:
+#   python Benchmark_ASCII_Art_Studio.py run [--output results.json] [--quick]
+#   python Benchmark_ASCII_Art_Studio.py compare baseline.json results.json [--threshold 10]
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from PIL import Image
+
+# The resource module, used to report the peak resident memory of the process, is not available on Windows.
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from ASCII_Art_Studio import ASCII_Art_Studio, Render_Cache
+
+# The sample images shipped with the repository.
+SAMPLE_IMAGES = ['stadshuset.jpg', 'slalom.jpg', 'grayscale.jpg']
+
+# Sizes of the synthetic images generated for each benchmark run, to cover camera-sized inputs.
+SYNTHETIC_IMAGE_SIZES = [(4000, 3000), (8000, 6000)]
+
+# Render widths in characters.
+BENCHMARK_WIDTHS = [50, 200, 800, 2000]
+
+# Each measurement is repeated and the fastest time is kept, which filters out scheduling noise.
+BENCHMARK_REPEATS = 3
+
+# A stage regresses when it becomes slower than the baseline by more than this percentage.
+REGRESSION_THRESHOLD_PERCENT = 10.0
+
+# Runs one stage in a fresh interpreter and prints the peak resident memory of that process. The
+# arguments are the directory of this module, the image file, the width ('-' for none) and the stage.
+PEAK_RSS_SCRIPT = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from Benchmark_ASCII_Art_Studio import _run_stage
+print(_run_stage(sys.argv[2], None if sys.argv[3] == '-' else int(sys.argv[3]), sys.argv[4]))
+"""
+
+def _max_rss_bytes():
+    # The peak resident memory of this process, or None where the resource module is not available.
+    # On Linux ru_maxrss of a new process also counts the peak of the parent it was forked from, so
+    # the high-water mark of the process's own memory is read from /proc instead.
+    try:
+        with open('/proc/self/status') as status_file:
+            for line in status_file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+def _create_synthetic_image(directory, size):
+    # Writes a JPEG of the given size combining a gradient with noise, so that both smooth areas and
+    # fine detail go through the decoder and the resampling filter.
+    width, height = size
+    gradient = Image.linear_gradient('L').resize(size)
+    noise = Image.effect_noise(size, 64)
+    filename = os.path.join(directory, f'synthetic_{width}x{height}.jpg')
+    Image.blend(gradient, noise, 0.5).convert('RGB').save(filename, quality=90)
+    return filename
+
+def _measure(function, repeats):
+    """
+    Time a function.
+
+    Parameters:
+    - function: callable without arguments, the stage to measure.
+    - repeats: int, how many timed runs to make; the fastest is reported.
+
+    Returns:
+    - tuple, (best_seconds, result of the last call).
+    """
+    best_seconds = float('inf')
+    result = None
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        result = function()
+        best_seconds = min(best_seconds, time.perf_counter() - start_time)
+    return best_seconds, result
+
+def _run_stage(filename, width, stage):
+    """
+    Run one stage of the pipeline, with the stages it depends on, and report the peak resident memory
+    of the process. This runs inside a fresh interpreter started by `_measure_peak_rss`.
+
+    Parameters:
+    - filename: str, the image file.
+    - width: int, the render width in characters, or None for the 'load' stage.
+    - stage: str, one of 'load', '_resize_image', '_convert_to_ascii' and 'render'.
+
+    Returns:
+    - int, the peak resident memory in bytes, or None where it cannot be measured.
+    """
+    studio = ASCII_Art_Studio(render_cache=Render_Cache(max_entries=0))
+    studio.load(filename)
+    if stage == '_resize_image':
+        studio._resize_image(width)
+    elif stage == '_convert_to_ascii':
+        studio._convert_to_ascii(studio._resize_image(width))
+    elif stage == 'render':
+        studio.render(new_width=width)
+    return _max_rss_bytes()
+
+def _measure_peak_rss(filename, width, stage):
+    """
+    Measure the peak resident memory of a stage in a fresh process. Unlike tracing Python allocations,
+    this includes the pixel buffers Pillow allocates outside the Python allocator. The peak covers the
+    whole process: the interpreter, the modules and the stages the measured one depends on.
+
+    Parameters:
+    - filename: str, the image file.
+    - width: int, the render width in characters, or None for the 'load' stage.
+    - stage: str, the stage to run.
+
+    Returns:
+    - int, the peak resident memory in bytes, or None where it cannot be measured.
+    """
+    if resource is None:
+        return None
+    module_directory = os.path.dirname(os.path.abspath(__file__))
+    command = [sys.executable, '-c', PEAK_RSS_SCRIPT, module_directory, filename, str(width or '-'), stage]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return int(output)
+
+def _record(results, image_name, width, stage, seconds, peak_rss, pixels, chars):
+    # Appends one measurement with its throughput figures and the peak memory of the stage.
+    results.append({
+        'input': image_name,
+        'width': width,
+        'stage': stage,
+        'seconds': seconds,
+        'pixels_per_second': pixels / seconds if seconds else 0.0,
+        'chars_per_second': chars / seconds if seconds else 0.0,
+        'peak_rss_bytes': peak_rss,
+    })
+
+def run_benchmarks(images=SAMPLE_IMAGES, synthetic_sizes=SYNTHETIC_IMAGE_SIZES, widths=BENCHMARK_WIDTHS,
+                   repeats=BENCHMARK_REPEATS):
+    """
+    Benchmark every stage of the pipeline for each input image and width.
+
+    Parameters:
+    - images: list of str, image files to benchmark.
+    - synthetic_sizes: list of (width, height) tuples, synthetic images generated for the run.
+    - widths: list of int, render widths in characters.
+    - repeats: int, timed runs per measurement.
+
+    Returns:
+    - dict, the environment description under 'meta' and one entry per measurement under 'results'.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        inputs = list(images) + [_create_synthetic_image(temp_dir, size) for size in synthetic_sizes]
+        for filename in inputs:
+            image_name = os.path.basename(filename)
+            # Caching is disabled so that every render really runs the whole pipeline.
+            studio = ASCII_Art_Studio(render_cache=Render_Cache(max_entries=0))
+            seconds, message = _measure(lambda: studio.load(filename), repeats)
+            if studio.current_image is None:
+                raise IOError(f"Cannot benchmark {filename}: {message}")
+            source_pixels = studio.current_image.width * studio.current_image.height
+            peak_rss = _measure_peak_rss(filename, None, 'load')
+            _record(results, image_name, None, 'load', seconds, peak_rss, source_pixels, 0)
+
+            for width in widths:
+                seconds, resized = _measure(lambda: studio._resize_image(width), repeats)
+                chars = resized.width * resized.height
+                peak_rss = _measure_peak_rss(filename, width, '_resize_image')
+                _record(results, image_name, width, '_resize_image', seconds, peak_rss, source_pixels, chars)
+
+                seconds, _ = _measure(lambda: studio._convert_to_ascii(resized), repeats)
+                peak_rss = _measure_peak_rss(filename, width, '_convert_to_ascii')
+                _record(results, image_name, width, '_convert_to_ascii', seconds, peak_rss, chars, chars)
+
+                seconds, _ = _measure(lambda: studio.render(new_width=width), repeats)
+                peak_rss = _measure_peak_rss(filename, width, 'render')
+                _record(results, image_name, width, 'render', seconds, peak_rss, source_pixels, chars)
+
+    meta = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeats': repeats,
+        'max_rss_bytes': _max_rss_bytes(),
+    }
+    return {'meta': meta, 'results': results}
+
+def compare_results(baseline, current, threshold_percent=REGRESSION_THRESHOLD_PERCENT):
+    """
+    Find the measurements that became slower than the baseline by more than the threshold.
+
+    Parameters:
+    - baseline: dict, results previously returned by `run_benchmarks`.
+    - current: dict, the results to check.
+    - threshold_percent: float, the allowed slowdown in percent.
+
+    Returns:
+    - list of dict, one entry per regression with the stage, input, width and both timings.
+    """
+    baseline_seconds = {
+        (entry['input'], entry['width'], entry['stage']): entry['seconds'] for entry in baseline['results']
+    }
+    regressions = []
+    for entry in current['results']:
+        key = (entry['input'], entry['width'], entry['stage'])
+        if key not in baseline_seconds or not baseline_seconds[key]:
+            continue
+        change_percent = (entry['seconds'] / baseline_seconds[key] - 1) * 100
+        if change_percent > threshold_percent:
+            regressions.append({
+                'input': entry['input'],
+                'width': entry['width'],
+                'stage': entry['stage'],
+                'baseline_seconds': baseline_seconds[key],
+                'seconds': entry['seconds'],
+                'change_percent': change_percent,
+            })
+    return regressions
+
+def format_results(report):
+    """
+    Format benchmark results as a printable table.
+
+    Parameters:
+    - report: dict, the results returned by `run_benchmarks`.
+
+    Returns:
+    - str, one line per measurement; the peak resident memory of the stage's process is in MiB.
+    """
+    lines = [f"{'input':<26}{'width':>6}  {'stage':<18}{'ms':>10}{'Mpixels/s':>12}{'Mchars/s':>10}{'peak MiB':>10}"]
+    for entry in report['results']:
+        peak_rss = entry['peak_rss_bytes']
+        lines.append(
+            f"{entry['input']:<26}{entry['width'] or '-':>6}  {entry['stage']:<18}{entry['seconds'] * 1000:>10.2f}"
+            f"{entry['pixels_per_second'] / 1e6:>12.1f}{entry['chars_per_second'] / 1e6:>10.2f}"
+            f"{'-' if peak_rss is None else f'{peak_rss / 2 ** 20:.1f}':>10}"
+        )
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the ASCII Art Studio rendering pipeline.")
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+    run_parser = subparsers.add_parser('run', help="run the benchmarks and write JSON results")
+    run_parser.add_argument('--output', default='benchmark_results.json', help="JSON file receiving the results")
+    run_parser.add_argument('--quick', action='store_true', help="skip the synthetic images and the widest renders")
+    compare_parser = subparsers.add_parser('compare', help="fail when results regress against a baseline")
+    compare_parser.add_argument('baseline', help="JSON results of the baseline run")
+    compare_parser.add_argument('current', help="JSON results to check")
+    compare_parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD_PERCENT,
+                                help="allowed slowdown per stage in percent")
+    arguments = parser.parse_args()
+
+    if arguments.mode == 'run':
+        if arguments.quick:
+            benchmark_report = run_benchmarks(synthetic_sizes=[], widths=[50, 200])
+        else:
+            benchmark_report = run_benchmarks()
+        with open(arguments.output, 'w') as output_file:
+            json.dump(benchmark_report, output_file, indent=2)
+        print(format_results(benchmark_report))
+        print(f"Results written to {arguments.output}")
+    else:
+        with open(arguments.baseline) as baseline_file, open(arguments.current) as current_file:
+            found_regressions = compare_results(json.load(baseline_file), json.load(current_file), arguments.threshold)
+        for regression in found_regressions:
+            print(f"REGRESSION {regression['stage']} on {regression['input']} at width {regression['width']}: "
+                  f"{regression['baseline_seconds'] * 1000:.2f} ms -> {regression['seconds'] * 1000:.2f} ms "
+                  f"(+{regression['change_percent']:.1f}%)")
+        if found_regressions:
+            raise SystemExit(1)
+        print(f"No stage regressed by more than {arguments.threshold}%.")
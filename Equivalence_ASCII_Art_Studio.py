@@ -0,0 +1,169 @@
+# Equivalence_ASCII_Art_Studio.py
+
+# Checks that every fast rendering path produces exactly the output of the per-pixel reference engine,
+# including the integer truncation at the ends of the character ramp, on many synthetic grayscale
+# images, and times every path in the same run.
+#
+# Usage:
+#   python Equivalence_ASCII_Art_Studio.py [--count 500] [--seed 0]
+import random
+import time
+
+from PIL import Image
+
+from ASCII_Art_Studio import CHARACTER_RAMPS, ASCII_Art_Studio
+
+# The number of synthetic images generated by default, and the seed making a run reproducible.
+EQUIVALENCE_CASES = 500
+EQUIVALENCE_SEED = 0
+
+# The kinds of synthetic images: smooth gradients, noise, pure black and white edges, flat images and
+# images containing every 8-bit value in order.
+IMAGE_KINDS = ('horizontal gradient', 'vertical gradient', 'noise', 'edges', 'flat', 'all values')
+
+# The rows per band used by the banded fast path, small and odd so that the last band is usually partial.
+BAND_ROWS = 7
+
+def _banded(studio, image, levels):
+    # Converts the image band by band, as `render_iter` and the watch mode do, and joins the bands.
+    return ''.join(
+        studio._convert_to_ascii(image.crop((0, top, image.width, min(top + BAND_ROWS, image.height))), levels)
+        for top in range(0, image.height, BAND_ROWS)
+    )
+
+def _generate_image(rng, kind):
+    # Generates one grayscale image of the given kind at a random, often odd, size including width 1.
+    width = rng.choice([1, 1, 2, 3, rng.randint(4, 31), rng.randint(32, 257)])
+    height = rng.choice([1, 2, rng.randint(3, 64)])
+    if kind == 'horizontal gradient':
+        row = bytes(value * 255 // max(width - 1, 1) for value in range(width))
+        data = row * height
+    elif kind == 'vertical gradient':
+        data = b''.join(bytes([value * 255 // max(height - 1, 1)]) * width for value in range(height))
+    elif kind == 'noise':
+        data = rng.randbytes(width * height)
+    elif kind == 'edges':
+        data = bytes(rng.choice((0, 255)) for _ in range(width * height))
+    elif kind == 'flat':
+        data = bytes([rng.choice((0, 255, rng.randint(0, 255)))]) * (width * height)
+    else:
+        data = bytes(value % 256 for value in range(width * height))
+    return Image.frombytes('L', (width, height), data)
+
+def _configure(rng, studio):
+    # Picks a random character ramp and tone pipeline, returning a description of the choice.
+    ramp = rng.choice(list(CHARACTER_RAMPS))
+    studio.set_ramp(ramp)
+    for _ in range(rng.randint(0, 3)):
+        name = rng.choice(('gamma', 'contrast', 'invert'))
+        parameters = () if name == 'invert' else (round(rng.uniform(0.3, 3.0), 2),)
+        studio.add_curve(name, *parameters)
+    studio.auto_levels = rng.random() < 0.3
+    curves = ', '.join(' '.join([name] + [str(value) for value in parameters]) for name, parameters in studio.curves)
+    return f"ramp {ramp}, curves [{curves}], auto-levels {'on' if studio.auto_levels else 'off'}"
+
+def _first_mismatch(image, expected, actual):
+    # Locates the first cell where two renders of `image` differ.
+    expected_lines = expected.split('\n')
+    actual_lines = actual.split('\n')
+    for row in range(max(len(expected_lines), len(actual_lines))):
+        expected_line = expected_lines[row] if row < len(expected_lines) else ''
+        actual_line = actual_lines[row] if row < len(actual_lines) else ''
+        for column in range(max(len(expected_line), len(actual_line))):
+            expected_char = expected_line[column] if column < len(expected_line) else None
+            actual_char = actual_line[column] if column < len(actual_line) else None
+            if expected_char != actual_char:
+                inside = row < image.height and column < image.width
+                return {
+                    'row': row,
+                    'column': column,
+                    'gray_value': image.getpixel((column, row)) if inside else None,
+                    'expected': expected_char,
+                    'actual': actual_char,
+                }
+    return None
+
+def run_equivalence(count=EQUIVALENCE_CASES, seed=EQUIVALENCE_SEED, studio_class=ASCII_Art_Studio):
+    """
+    Render many synthetic images with the per-pixel reference engine and with every fast path, and
+    compare the outputs character by character. The fast paths are every engine registered in
+    `RENDER_ENGINES` and a banded conversion through the selected engine. The first case is rendered
+    with the default settings; the others use a random character ramp and tone pipeline.
+
+    Parameters:
+    - count: int, the number of synthetic images.
+    - seed: int, the seed of the random generator, so that a failing run can be repeated.
+    - studio_class: type, the ASCII_Art_Studio class, or a subclass registering more engines.
+
+    Returns:
+    - dict, the number of cases, the first mismatch of every failing path under 'mismatches' and the
+      total seconds spent in every path under 'seconds'.
+    """
+    rng = random.Random(seed)
+    paths = {name: method for name, method in studio_class.RENDER_ENGINES.items() if name != 'reference'}
+    seconds = {'reference': 0.0, **{name: 0.0 for name in paths}, 'bands': 0.0}
+    mismatches = {}
+    for case in range(count):
+        kind = IMAGE_KINDS[case % len(IMAGE_KINDS)]
+        image = _generate_image(rng, kind)
+        studio = studio_class()
+        settings = _configure(rng, studio) if case else "default settings"
+        levels = studio._measure_levels(image)
+        # The translation table is built once per settings in real use, so it is not part of the timings.
+        studio._get_ascii_lut(levels)
+
+        start_time = time.perf_counter()
+        expected = studio._convert_to_ascii_reference(image, levels)
+        seconds['reference'] += time.perf_counter() - start_time
+
+        outputs = {}
+        for name, method in paths.items():
+            start_time = time.perf_counter()
+            outputs[name] = getattr(studio, method)(image, levels)
+            seconds[name] += time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        outputs['bands'] = _banded(studio, image, levels)
+        seconds['bands'] += time.perf_counter() - start_time
+
+        for name, actual in outputs.items():
+            if name in mismatches or actual == expected:
+                continue
+            mismatch = _first_mismatch(image, expected, actual)
+            mismatches[name] = dict(mismatch, case=case, kind=kind, size=image.size, settings=settings)
+    return {'cases': count, 'seed': seed, 'mismatches': mismatches, 'seconds': seconds}
+
+def format_report(report):
+    """
+    Format the result of `run_equivalence` as printable text.
+
+    Parameters:
+    - report: dict, the result returned by `run_equivalence`.
+
+    Returns:
+    - str, the timing and speedup of every path followed by the first mismatch of every failing path.
+    """
+    reference_seconds = report['seconds']['reference']
+    lines = [f"{report['cases']} synthetic images, seed {report['seed']}:"]
+    for name, total in report['seconds'].items():
+        speedup = reference_seconds / total if total else float('inf')
+        status = 'MISMATCH' if name in report['mismatches'] else 'ok'
+        lines.append(f"  {name:<12}{total * 1000:>10.2f} ms  {speedup:>8.1f}x  {status}")
+    for name, mismatch in report['mismatches'].items():
+        lines.append(
+            f"{name}: first mismatch in case {mismatch['case']} ({mismatch['kind']}, {mismatch['size'][0]}x"
+            f"{mismatch['size'][1]}, {mismatch['settings']}) at row {mismatch['row']}, column {mismatch['column']}: "
+            f"gray value {mismatch['gray_value']}, expected {mismatch['expected']!r}, got {mismatch['actual']!r}"
+        )
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check every rendering path against the per-pixel reference engine.")
+    parser.add_argument('--count', type=int, default=EQUIVALENCE_CASES, help="number of synthetic images")
+    parser.add_argument('--seed', type=int, default=EQUIVALENCE_SEED, help="seed of the random generator")
+    arguments = parser.parse_args()
+
+    equivalence_report = run_equivalence(arguments.count, arguments.seed)
+    print(format_report(equivalence_report))
+    raise SystemExit(1 if equivalence_report['mismatches'] else 0)
@@ -0,0 +1,152 @@
+# Image_Workspace.py
+
+# OrderedDict keeps the named images in least-recently-used order, oldest first.
+from collections import OrderedDict
+
+from ASCII_Art_Studio import LOAD_SUCCESS_MESSAGE, ASCII_Art_Studio
+
+# The default budget for the decoded pixel data of all images in a workspace.
+WORKSPACE_MAX_DECODED_BYTES = 256 * 1024 * 1024
+
+class Image_Workspace:
+    """
+    Keeps several named images, each in its own ASCII_Art_Studio, within a budget for their decoded
+    pixel data. When the budget is exceeded the decoded data of the least recently used images is
+    released; only their filenames are kept, and they are decoded again transparently the next time
+    they are used. The active image is never evicted.
+    """
+
+    def __init__(self, max_bytes=WORKSPACE_MAX_DECODED_BYTES, studio_factory=ASCII_Art_Studio):
+        """
+        Initialize an empty workspace.
+
+        Parameters:
+        - max_bytes: int, the budget for the decoded pixel data of all images together.
+        - studio_factory: callable without arguments returning a new ASCII_Art_Studio, used for each
+          named image; it can for example share one render cache between all of them.
+        """
+        self.max_bytes = max_bytes
+        self.studio_factory = studio_factory
+        self._studios = OrderedDict()  # Maps name -> studio, least recently used first
+        self.active_name = None
+        self.evictions = 0  # How many times decoded data was released to respect the budget
+        self.reloads = 0    # How many times an evicted image was decoded again
+
+    def __contains__(self, name):
+        return name in self._studios
+
+    def __len__(self):
+        return len(self._studios)
+
+    def load(self, name, filename):
+        """
+        Load an image under a name and make it the active image. An image already using the name is replaced.
+
+        Parameters:
+        - name: str, the name of the image in the workspace.
+        - filename: str, the path to the image file to be loaded.
+
+        Returns:
+        - str, the message returned by `ASCII_Art_Studio.load`.
+        """
+        studio = self.studio_factory()
+        message = studio.load(filename)
+        if message != LOAD_SUCCESS_MESSAGE:
+            return message
+        self._studios.pop(name, None)
+        self._studios[name] = studio
+        self.active_name = name
+        self.enforce_budget()
+        return message
+
+    def use(self, name):
+        """
+        Make a named image the active one, decoding it again if it was evicted.
+
+        Parameters:
+        - name: str, the name of the image in the workspace.
+
+        Returns:
+        - ASCII_Art_Studio, the studio holding the image.
+
+        Raises:
+        - KeyError: if no image has that name.
+        - IOError: if an evicted image can no longer be decoded from its file.
+        """
+        studio = self._studios[name]
+        if not studio.has_image():
+            message = studio.load(studio.filename)
+            if message != LOAD_SUCCESS_MESSAGE:
+                raise IOError(f"Cannot reload '{name}' from {studio.filename}: {message}")
+            self.reloads += 1
+        self._studios.move_to_end(name)
+        self.active_name = name
+        self.enforce_budget()
+        return studio
+
+    def total_bytes(self):
+        """
+        Report the decoded pixel data currently held by all images.
+
+        Returns:
+        - int, the number of bytes.
+        """
+        return sum(studio.decoded_bytes() for studio in self._studios.values())
+
+    def enforce_budget(self):
+        """
+        Release the decoded data of the least recently used images until the workspace fits its budget.
+        Renders grow an image's pyramid levels, so this is also worth calling after rendering.
+
+        Returns:
+        - int, the number of images evicted.
+        """
+        total = self.total_bytes()
+        evicted = 0
+        for name, studio in self._studios.items():
+            if total <= self.max_bytes:
+                break
+            if name == self.active_name or not studio.has_image():
+                continue
+            total -= studio.release()
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def entries(self):
+        """
+        Describe every image in the workspace, least recently used first.
+
+        Returns:
+        - list of dict, the name, filename, residency, decoded bytes and active flag of each image.
+        """
+        return [
+            {
+                'name': name,
+                'filename': studio.filename,
+                'resident': studio.has_image(),
+                'bytes': studio.decoded_bytes(),
+                'active': name == self.active_name,
+            }
+            for name, studio in self._studios.items()
+        ]
+
+    def format(self):
+        """
+        Format the workspace contents and its memory usage as printable text.
+
+        Returns:
+        - str, one line per image followed by a summary line.
+        """
+        lines = []
+        resident = 0
+        for entry in reversed(self.entries()):
+            resident += entry['resident']
+            marker = '*' if entry['active'] else ' '
+            state = 'resident' if entry['resident'] else 'evicted'
+            lines.append(f"{marker} {entry['name']:<12}{state:<10}{entry['bytes']:>12} bytes  {entry['filename']}")
+        lines.append(
+            f"Workspace: {len(self._studios)} images, {resident} resident, {len(self._studios) - resident} evicted, "
+            f"{self.total_bytes()} of {self.max_bytes} bytes decoded, {self.evictions} evictions, {self.reloads} reloads"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,358 @@
+# Render_Server.py
+
+# A small HTTP/1.1 service exposing ASCII_Art_Studio to other programs:
+#   POST /render?width=N           renders the image sent as the request body
+#   GET  /render?path=P&width=N    renders an image file below the server's root directory
+#   GET  /metrics                  reports request counts, latency percentiles and cache usage as JSON
+#
+# asyncio handles the connections while the CPU-bound decoding and rendering run in a thread pool.
+# Pillow releases the GIL while decoding and resizing, so the threads render in parallel.
+import asyncio
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from ASCII_Art_Studio import ASCII_ART_WIDTH_IN_CHARACTERS, LOAD_SUCCESS_MESSAGE, ASCII_Art_Studio, Render_Cache
+
+# Renders accepted at the same time, running or waiting for a worker. Further requests get a 503.
+MAX_PENDING_RENDERS = 32
+
+# The number of decoded images kept for reuse across requests, and the budget for their pixel data.
+DECODED_IMAGE_CACHE_ENTRIES = 16
+DECODED_IMAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Limits protecting the server from oversized requests.
+MAX_REQUEST_BODY_BYTES = 64 * 1024 * 1024
+MAX_RENDER_WIDTH = 10000
+
+# The number of recent request latencies used for the percentiles reported by /metrics.
+LATENCY_WINDOW = 1024
+
+HTTP_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+class Http_Error(Exception):
+    """An error that is reported to the client with the given HTTP status and message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def _percentile(sorted_values, fraction):
+    # Returns the value at the given fraction of a sorted list using the nearest-rank method.
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+class Render_Server:
+    """
+    An asyncio HTTP server that renders images to ASCII art. Decoded images and finished renders are
+    shared between all requests, the number of renders in progress is bounded, and connections are
+    kept alive between requests.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8080, root='.', workers=None, max_pending=MAX_PENDING_RENDERS,
+                 image_cache_entries=DECODED_IMAGE_CACHE_ENTRIES, render_cache=None,
+                 image_cache_max_bytes=DECODED_IMAGE_CACHE_MAX_BYTES):
+        """
+        Initialize the server without starting it.
+
+        Parameters:
+        - host: str, the address to listen on; localhost by default.
+        - port: int, the port to listen on; 0 picks a free port.
+        - root: str, the directory that GET requests may read images from.
+        - workers: int, the number of rendering threads; defaults to the number of CPUs.
+        - max_pending: int, the number of renders accepted at once before answering 503.
+        - image_cache_entries: int, the number of decoded images kept between requests.
+        - render_cache: Render_Cache, the cache of finished renders; a default-sized one when omitted.
+        - image_cache_max_bytes: int, the budget for the decoded pixel data of the images kept between
+          requests; the most recently decoded image is kept even when it alone exceeds it.
+        """
+        self.host = host
+        self.port = port
+        self.root = os.path.realpath(root)
+        self.executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self.max_pending = max_pending
+        self.pending = 0
+        self.image_cache_entries = image_cache_entries
+        self.image_cache_max_bytes = image_cache_max_bytes
+        self._images = OrderedDict()  # Maps source identity -> (studio holding the decoded image, its decoded bytes)
+        self._image_bytes = 0         # The decoded bytes of all images in `_images`
+        self.render_cache = render_cache if render_cache is not None else Render_Cache()
+        self._lock = threading.Lock()  # Guards both caches, which the worker threads share
+        self.request_count = 0
+        self.status_counts = {}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self._server = None
+        self._connections = {}  # Maps the task serving each open connection -> its stream writer
+        self._loop = None
+        self._thread = None
+
+    def _get_studio(self, source, load_argument):
+        # Returns a studio holding the decoded image of `source`, decoding it on first use.
+        with self._lock:
+            entry = self._images.get(source)
+            if entry is not None:
+                self._images.move_to_end(source)
+                return entry[0]
+        # Renders are cached by the server, so the studio's own (unsynchronized) cache is disabled.
+        studio = ASCII_Art_Studio(render_cache=Render_Cache(max_entries=0))
+        message = studio.load(load_argument)
+        if message != LOAD_SUCCESS_MESSAGE:
+            raise Http_Error(404 if message == "The specified file was not found." else 400, message)
+        if not isinstance(load_argument, str):
+            # The studio would otherwise keep the request body alive for as long as the image is cached,
+            # outside the byte budget; a label naming the source is all it needs once decoded.
+            studio.filename = ':'.join(source)
+        decoded_bytes = studio.decoded_bytes()
+        with self._lock:
+            # Another request may have decoded the same source meanwhile.
+            previous = self._images.pop(source, None)
+            if previous is not None:
+                self._image_bytes -= previous[1]
+            self._images[source] = (studio, decoded_bytes)
+            self._image_bytes += decoded_bytes
+            while len(self._images) > 1 and (len(self._images) > self.image_cache_entries
+                                             or self._image_bytes > self.image_cache_max_bytes):
+                self._image_bytes -= self._images.popitem(last=False)[1][1]
+        return studio
+
+    def _render(self, source, load_argument, width):
+        # Worker thread: returns the ASCII art of `source` at `width`, from the cache when possible.
+        cache_key = (source, width)
+        with self._lock:
+            ascii_art = self.render_cache.get(cache_key)
+        if ascii_art is None:
+            ascii_art = self._get_studio(source, load_argument).render(new_width=width)
+            with self._lock:
+                self.render_cache.put(cache_key, ascii_art)
+        return ascii_art
+
+    def _resolve_path(self, path):
+        # Maps a requested path to a file below the root directory, refusing anything outside it.
+        full_path = os.path.realpath(os.path.join(self.root, path))
+        if os.path.commonpath([self.root, full_path]) != self.root:
+            raise Http_Error(404, "The specified file was not found.")
+        return full_path
+
+    async def _handle_render(self, method, query, body):
+        # Validates a render request and runs it in the worker pool, enforcing the pending limit.
+        try:
+            width = int(query.get('width', [ASCII_ART_WIDTH_IN_CHARACTERS])[0])
+        except ValueError:
+            raise Http_Error(400, "The width must be an integer.")
+        if not 1 <= width <= MAX_RENDER_WIDTH:
+            raise Http_Error(400, f"The width must be between 1 and {MAX_RENDER_WIDTH}.")
+        if method == 'POST':
+            if not body:
+                raise Http_Error(400, "The request body must contain an image.")
+            source = ('sha1', hashlib.sha1(body).hexdigest())
+            load_argument = io.BytesIO(body)
+        elif 'path' in query:
+            load_argument = self._resolve_path(query['path'][0])
+            try:
+                file_stat = os.stat(load_argument)
+            except OSError:
+                raise Http_Error(404, "The specified file was not found.")
+            source = (load_argument, file_stat.st_mtime_ns, file_stat.st_size)
+        else:
+            raise Http_Error(400, "GET /render requires a path parameter.")
+
+        if self.pending >= self.max_pending:
+            raise Http_Error(503, "The server is busy. Please retry later.")
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._render, source, load_argument, width)
+        finally:
+            self.pending -= 1
+
+    def metrics(self):
+        """
+        Report the server's request counters, latency percentiles and cache usage.
+
+        Returns:
+        - dict, the metrics served at /metrics.
+        """
+        latencies = sorted(self.latencies)
+        with self._lock:
+            render_cache_stats = self.render_cache.stats()
+            decoded_images = len(self._images)
+            decoded_image_bytes = self._image_bytes
+        return {
+            'requests': self.request_count,
+            'status_counts': {str(status): count for status, count in sorted(self.status_counts.items())},
+            'pending': self.pending,
+            'max_pending': self.max_pending,
+            'latency_ms': {
+                'samples': len(latencies),
+                'p50': _percentile(latencies, 0.50) * 1000,
+                'p90': _percentile(latencies, 0.90) * 1000,
+                'p99': _percentile(latencies, 0.99) * 1000,
+            },
+            'render_cache': render_cache_stats,
+            'decoded_images': decoded_images,
+            'decoded_image_bytes': decoded_image_bytes,
+        }
+
+    async def _dispatch(self, method, target, body):
+        # Routes one request and returns (status, content type, response body).
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        if url.path == '/render':
+            if method not in ('GET', 'POST'):
+                raise Http_Error(405, "Use GET or POST for /render.")
+            ascii_art = await self._handle_render(method, query, body)
+            return 200, 'text/plain; charset=ascii', ascii_art.encode('ascii')
+        if url.path == '/metrics':
+            return 200, 'application/json', json.dumps(self.metrics(), indent=2).encode('ascii')
+        raise Http_Error(404, f"Unknown path {url.path}.")
+
+    async def _read_request(self, reader):
+        # Reads one request and returns (method, target, version, headers, body), or None at end of stream.
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ', 2)
+        except ValueError:
+            raise Http_Error(400, "Malformed request line.")
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+        except ValueError:
+            raise Http_Error(400, "Malformed Content-Length header.")
+        if length < 0:
+            raise Http_Error(400, "Malformed Content-Length header.")
+        if length > MAX_REQUEST_BODY_BYTES:
+            raise Http_Error(413, "The request body is too large.")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target, version, headers, body
+
+    async def _handle_connection(self, reader, writer):
+        # Serves requests on one connection until the client closes it or asks for it to be closed.
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                keep_alive = False
+                start_time = None  # Set once a complete request has been read
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    start_time = time.perf_counter()
+                    method, target, version, headers, body = request
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+                    status, content_type, payload = await self._dispatch(method, target, body)
+                except Http_Error as e:
+                    status, content_type, payload = e.status, 'text/plain; charset=utf-8', e.message.encode('utf-8')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                except Exception as e:
+                    status, content_type, payload = 500, 'text/plain; charset=utf-8', f"{e}".encode('utf-8')
+                response_headers = [
+                    f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'Error')}",
+                    f"Content-Type: {content_type}",
+                    f"Content-Length: {len(payload)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                ]
+                if status == 503:
+                    response_headers.append("Retry-After: 1")
+                writer.write(('\r\n'.join(response_headers) + '\r\n\r\n').encode('latin-1') + payload)
+                await writer.drain()
+                self.request_count += 1
+                self.status_counts[status] = self.status_counts.get(status, 0) + 1
+                if start_time is not None:
+                    self.latencies.append(time.perf_counter() - start_time)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            del self._connections[asyncio.current_task()]
+            writer.close()
+
+    async def start(self):
+        """Start listening; the actual port is available in `port` afterwards."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Start the server and serve requests until cancelled."""
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self):
+        """
+        Run the server on its own event loop in a background thread, e.g. for tests or for embedding.
+
+        Returns:
+        - int, the port the server listens on.
+        """
+        started = threading.Event()
+
+        def run_loop():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+            # Stop accepting connections and close the ones still kept alive, so that their handlers see
+            # the end of the stream and finish, before closing the loop.
+            self._server.close()
+            handlers = list(self._connections)
+            for writer in self._connections.values():
+                writer.close()
+            self._loop.run_until_complete(asyncio.gather(*handlers, return_exceptions=True))
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run_loop, daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.port
+
+    def stop(self):
+        """Stop a server started with `start_in_thread` and shut down its worker threads."""
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+        self.executor.shutdown(wait=True)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve ASCII art renders over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: localhost only)")
+    parser.add_argument('--port', type=int, default=8080, help="port to listen on")
+    parser.add_argument('--root', default='.', help="directory GET /render?path=... may read from")
+    parser.add_argument('--workers', type=int, default=None, help="rendering threads (default: all CPUs)")
+    parser.add_argument('--max-pending', type=int, default=MAX_PENDING_RENDERS,
+                        help="renders accepted at once before answering 503")
+    arguments = parser.parse_args()
+
+    render_server = Render_Server(host=arguments.host, port=arguments.port, root=arguments.root,
+                                  workers=arguments.workers, max_pending=arguments.max_pending)
+    print(f"Serving ASCII art on http://{arguments.host}:{arguments.port}/render")
+    try:
+        asyncio.run(render_server.serve_forever())
+    except KeyboardInterrupt:
+        pass
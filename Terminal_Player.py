@@ -0,0 +1,347 @@
+# Terminal_Player.py
+
+# queue and threading let frames be decoded and rendered ahead of playback in a worker thread,
+# while time paces the playback at the frame rate of the source. os and hashlib let the watch mode
+# detect file changes and changed bands of the picture.
+import hashlib
+import os
+import queue
+import threading
+import time
+
+from ASCII_Art_Studio import ASCII_ART_WIDTH_IN_CHARACTERS, LOAD_SUCCESS_MESSAGE
+
+# ANSI escape sequences used to redraw the terminal in place.
+CLEAR_SCREEN = b'\x1b[2J\x1b[H'
+CLEAR_TO_END_OF_LINE = b'\x1b[K'
+
+# How many rendered frames the worker thread may prepare ahead of the one being displayed.
+PREFETCH_FRAMES = 8
+
+# How often the watch mode checks the file for changes, in seconds.
+WATCH_POLL_INTERVAL = 0.25
+
+# The height, in rows of the resized image, of the bands the watch mode compares between updates.
+WATCH_BAND_ROWS = 4
+
+def _move_cursor(row):
+    # Returns the escape sequence moving the cursor to the start of the given 0-based terminal row.
+    return b'\x1b[%d;1H' % (row + 1)
+
+class Line_Delta_Writer:
+    """
+    Draws successive screens of text on a terminal by rewriting only the lines that changed since
+    the previous screen. The first screen clears the terminal; later ones position the cursor on
+    each changed line, so unchanged content costs no terminal bandwidth at all.
+    """
+
+    def __init__(self, stream):
+        """
+        Initialize the writer.
+
+        Parameters:
+        - stream: a binary file-like object connected to the terminal, such as `sys.stdout.buffer`.
+        """
+        self.stream = stream
+        self.previous_lines = None  # The lines currently shown on the terminal
+        self.bytes_written = 0
+
+    def draw(self, lines):
+        """
+        Show a new screen of text.
+
+        Parameters:
+        - lines: list of str, the lines of the new screen without trailing newlines.
+
+        Returns:
+        - int, the number of lines that were redrawn.
+        """
+        if self.previous_lines is None:
+            self.previous_lines = []
+            output = [CLEAR_SCREEN]
+        else:
+            output = []
+        previous_lines = self.previous_lines
+        changed = 0
+        for row in range(max(len(lines), len(previous_lines))):
+            line = lines[row] if row < len(lines) else ''
+            if row < len(previous_lines) and previous_lines[row] == line:
+                continue
+            output.append(_move_cursor(row) + line.encode('ascii') + CLEAR_TO_END_OF_LINE)
+            changed += 1
+        # Leave the cursor below the picture so that later output does not overwrite it.
+        output.append(_move_cursor(len(lines)))
+        data = b''.join(output)
+        self.stream.write(data)
+        self.stream.flush()
+        self.bytes_written += len(data)
+        self.previous_lines = list(lines)
+        return changed
+
+class Animation_Player:
+    """
+    Plays every frame of the image loaded in an ASCII_Art_Studio as ASCII art on a terminal. A worker
+    thread decodes and renders frames ahead of playback while the main thread shows each frame at its
+    scheduled time through a Line_Delta_Writer. A frame whose display slot has passed is dropped when a
+    newer frame is already waiting, so that the playback keeps the frame rate of the source.
+    """
+
+    def __init__(self, art_studio, stream, new_width=ASCII_ART_WIDTH_IN_CHARACTERS, loops=1,
+                 prefetch=PREFETCH_FRAMES, clock=time.monotonic, sleep=time.sleep):
+        """
+        Initialize the player.
+
+        Parameters:
+        - art_studio: ASCII_Art_Studio, the studio holding the animation to play.
+        - stream: a binary file-like object connected to the terminal.
+        - new_width: int, the width of the ASCII art in characters.
+        - loops: int, how many times the animation is played.
+        - prefetch: int, the number of frames rendered ahead of playback.
+        - clock: callable returning the current time in seconds; replaceable for testing.
+        - sleep: callable pausing for a number of seconds; replaceable for testing.
+        """
+        self.art_studio = art_studio
+        self.writer = Line_Delta_Writer(stream)
+        self.new_width = new_width
+        self.loops = loops
+        self.prefetch = prefetch
+        self.clock = clock
+        self.sleep = sleep
+
+    def _render_ahead(self, frames, stop):
+        # Worker thread: renders frames into the bounded queue, followed by None once all loops are done.
+        # When the animation loops, frames rendered during the first loop are kept and replayed by the
+        # later loops; a single loop keeps none, so memory stays bounded by the queue.
+        def put(item):
+            # Blocks while the queue is full, but gives up once playback has been stopped.
+            while not stop.is_set():
+                try:
+                    frames.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        try:
+            rendered = []
+            frame_iterator = self.art_studio.render_frames(self.new_width)
+            while True:
+                start_time = time.perf_counter()
+                frame = next(frame_iterator, None)
+                if frame is None:
+                    break
+                if self.loops > 1:
+                    rendered.append(frame)
+                if not put(frame + (time.perf_counter() - start_time,)):
+                    return
+            for _ in range(self.loops - 1):
+                for frame in rendered:
+                    if not put(frame + (0.0,)):
+                        return
+        except Exception as e:
+            put(e)
+        put(None)
+
+    def play(self):
+        """
+        Play the animation, showing each frame at the time given by the frame durations of the source.
+        Ctrl+C ends the playback early.
+
+        Returns:
+        - dict, playback statistics: the number of frames shown and dropped, the render time of each
+          frame in milliseconds, the bytes written to the terminal and the elapsed time in seconds.
+
+        Raises:
+        - ValueError: if no image is loaded.
+        """
+        if not self.art_studio.has_image():
+            raise ValueError("No image loaded to animate.")
+        frames = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        worker = threading.Thread(target=self._render_ahead, args=(frames, stop), daemon=True)
+        worker.start()
+
+        stats = {'frames': 0, 'shown': 0, 'dropped': 0, 'render_ms': [], 'bytes_written': 0, 'elapsed': 0.0}
+        start_time = self.clock()
+        frame_due = start_time  # The time at which the next frame should appear
+        try:
+            while True:
+                frame = frames.get()
+                if frame is None:
+                    break
+                if isinstance(frame, Exception):
+                    raise frame
+                ascii_art, duration, render_seconds = frame
+                stats['frames'] += 1
+                stats['render_ms'].append(render_seconds * 1000)
+                frame_end = frame_due + duration / 1000
+                now = self.clock()
+                if now >= frame_end and not frames.empty():
+                    # The frame's display slot has already passed and a newer frame is ready: skip this one
+                    # to catch up with the source.
+                    stats['dropped'] += 1
+                else:
+                    if now < frame_due:
+                        self.sleep(frame_due - now)
+                    self.writer.draw(ascii_art.splitlines())
+                    stats['shown'] += 1
+                frame_due = frame_end
+            # Let the last frame stay on screen for its full duration.
+            now = self.clock()
+            if now < frame_due:
+                self.sleep(frame_due - now)
+        except KeyboardInterrupt:
+            pass  # The worker is stopped below and the statistics so far are returned
+        finally:
+            stop.set()
+            worker.join()
+        stats['bytes_written'] = self.writer.bytes_written
+        stats['elapsed'] = self.clock() - start_time
+        return stats
+
+class Image_Watcher:
+    """
+    Shows an image file as ASCII art on a terminal and keeps it up to date while another process
+    overwrites the file. The file is polled with `os.stat`, so an unchanged file costs a single stat
+    call. After a change the image is decoded and resized again, and its rows are hashed in bands:
+    only the bands whose luminance changed are converted to characters, and only their lines are
+    redrawn through a Line_Delta_Writer.
+    """
+
+    def __init__(self, art_studio, filename, stream, new_width=ASCII_ART_WIDTH_IN_CHARACTERS,
+                 band_rows=WATCH_BAND_ROWS, interval=WATCH_POLL_INTERVAL, sleep=time.sleep):
+        """
+        Initialize the watcher.
+
+        Parameters:
+        - art_studio: ASCII_Art_Studio, the studio used to load and render the file.
+        - filename: str, the image file to watch.
+        - stream: a binary file-like object connected to the terminal.
+        - new_width: int, the width of the ASCII art in characters.
+        - band_rows: int, the number of rows of the resized image compared as one band.
+        - interval: float, the time between two polls in seconds.
+        - sleep: callable pausing for a number of seconds; replaceable for testing.
+        """
+        self.art_studio = art_studio
+        self.filename = filename
+        self.writer = Line_Delta_Writer(stream)
+        self.new_width = new_width
+        self.band_rows = band_rows
+        self.interval = interval
+        self.sleep = sleep
+        self._signature = None    # The (mtime, size) of the file when it was last rendered
+        self._size = None         # The size of the resized image of the last update
+        self._band_hashes = []    # The digest of every band of the last update
+        self._lut = None          # The tone pipeline table the shown lines were mapped with
+        self._lines = []          # The lines currently shown
+        self.stats = {'polls': 0, 'updates': 0, 'failed_loads': 0, 'bands_rendered': 0, 'bands_skipped': 0,
+                      'lines_redrawn': 0, 'bytes_written': 0}
+
+    def _file_signature(self):
+        # Returns the modification time and size of the file, or None while it does not exist.
+        try:
+            file_stat = os.stat(self.filename)
+        except OSError:
+            return None
+        return file_stat.st_mtime_ns, file_stat.st_size
+
+    def poll(self):
+        """
+        Check the file once and redraw the bands that changed since the last update.
+
+        Returns:
+        - int, the number of terminal lines redrawn, or None when the file did not change or could not be loaded.
+        """
+        stats = self.stats
+        stats['polls'] += 1
+        signature = self._file_signature()
+        if signature is None or signature == self._signature:
+            return None
+        if self.art_studio.load(self.filename) != LOAD_SUCCESS_MESSAGE:
+            # The file is probably still being written; it is loaded again on the next poll.
+            stats['failed_loads'] += 1
+            return None
+        self._signature = signature
+        stats['updates'] += 1
+
+        resized = self.art_studio._resize_image(self.new_width)
+        width, height = resized.size
+        # With auto-levels a change anywhere can remap every band, so the table is compared as well.
+        levels = self.art_studio._measure_levels(resized)
+        lut = self.art_studio._get_ascii_lut(levels)
+        if resized.size != self._size or lut != self._lut:
+            self._lut = lut
+            self._size = resized.size
+            self._band_hashes = []
+            self._lines = [''] * height
+        pixels = resized.tobytes()
+        band_hashes = []
+        for top in range(0, height, self.band_rows):
+            bottom = min(top + self.band_rows, height)
+            digest = hashlib.blake2b(pixels[top * width:bottom * width], digest_size=16).digest()
+            band = len(band_hashes)
+            band_hashes.append(digest)
+            if band < len(self._band_hashes) and self._band_hashes[band] == digest:
+                stats['bands_skipped'] += 1
+                continue
+            band_image = resized.crop((0, top, width, bottom))
+            self._lines[top:bottom] = self.art_studio._convert_to_ascii(band_image, levels).splitlines()
+            stats['bands_rendered'] += 1
+        unchanged = band_hashes == self._band_hashes
+        self._band_hashes = band_hashes
+        if unchanged:
+            return 0
+        redrawn = self.writer.draw(self._lines)
+        stats['lines_redrawn'] += redrawn
+        stats['bytes_written'] = self.writer.bytes_written
+        return redrawn
+
+    def watch(self, max_polls=None):
+        """
+        Poll the file until interrupted with Ctrl+C, or until `max_polls` polls have been made.
+
+        Parameters:
+        - max_polls: int, optional, the number of polls after which to stop.
+
+        Returns:
+        - dict, watch statistics: polls, updates, failed loads, bands rendered and skipped, lines redrawn
+          and bytes written to the terminal.
+        """
+        try:
+            while max_polls is None or self.stats['polls'] < max_polls:
+                self.poll()
+                self.sleep(self.interval)
+        except KeyboardInterrupt:
+            pass
+        return self.stats
+
+def format_watch_stats(stats):
+    """
+    Format the statistics returned by `Image_Watcher.watch` as printable text.
+
+    Parameters:
+    - stats: dict, the watch statistics.
+
+    Returns:
+    - str, a one-line summary of the watch session.
+    """
+    return (f"Watched {stats['polls']} polls, {stats['updates']} updates ({stats['failed_loads']} failed loads), "
+            f"{stats['bands_rendered']} bands rendered, {stats['bands_skipped']} unchanged, "
+            f"{stats['lines_redrawn']} lines redrawn, {stats['bytes_written']} bytes written.")
+
+def format_playback_stats(stats):
+    """
+    Format the statistics returned by `Animation_Player.play` as printable text.
+
+    Parameters:
+    - stats: dict, the playback statistics.
+
+    Returns:
+    - str, a one-line summary of the playback.
+    """
+    render_ms = stats['render_ms']
+    average_ms = sum(render_ms) / len(render_ms) if render_ms else 0.0
+    maximum_ms = max(render_ms) if render_ms else 0.0
+    return (f"Played {stats['shown']} of {stats['frames']} frames in {stats['elapsed']:.2f}s "
+            f"({stats['dropped']} dropped), render time per frame: avg {average_ms:.1f} ms, "
+            f"max {maximum_ms:.1f} ms, {stats['bytes_written']} bytes written.")
@@ -2,9 +2,26 @@
 
 import unittest
 from unittest.mock import patch  # Import the patch function
-from ASCII_Art_Studio import ASCII_Art_Studio
+import http.client
+import importlib.util
+import io
+import json
+import re
+import os
+import subprocess
+import sys
+import shutil
+import tempfile
+from ASCII_Art_Studio import GLYPH_CHARACTERS, PYRAMID_MAX_MEAN_ERROR, ASCII_Art_Studio, Luminance_Grid, Render_Cache
 from User_Interface import User_Interface
-from PIL import Image
+from Image_Workspace import Image_Workspace
+from Batch_Renderer import Batch_Renderer
+from Render_Server import Render_Server
+from Benchmark_ASCII_Art_Studio import compare_results, format_results, resource, run_benchmarks
+from Equivalence_ASCII_Art_Studio import run_equivalence
+from Tiled_Renderer import Tiled_Renderer
+from Terminal_Player import Animation_Player, Image_Watcher, Line_Delta_Writer
+from PIL import Image, ImageChops, ImageStat
 
 class Custom_Test_Result(unittest.TextTestResult):
     """
@@ -164,6 +181,361 @@ class Test_ASCII_Art_Studio(unittest.TestCase):
         )
         self.assertEqual(ascii_art, expected_ascii_art)
 
+    def test_render_engines_match_reference(self):
+        """Test that the lookup-table engine produces byte-identical output to the per-pixel reference."""
+        reference_studio = ASCII_Art_Studio(engine='reference')
+        lut_studio = ASCII_Art_Studio(engine='lut')
+        for filename in ('stadshuset.jpg', 'slalom.jpg', 'grayscale.jpg'):
+            reference_studio.load(filename)
+            lut_studio.load(filename)
+            for width in (7, 37, 120):
+                self.assertEqual(lut_studio.render(new_width=width), reference_studio.render(new_width=width))
+
+    def test_tone_pipeline(self):
+        """Test that ramps, tone curves and auto-levels apply identically in both engines and in streamed renders."""
+        reference_studio = ASCII_Art_Studio(engine='reference')
+        lut_studio = ASCII_Art_Studio(engine='lut')
+        for studio in (reference_studio, lut_studio):
+            studio.load('slalom.jpg')
+            studio.set_ramp('detailed')
+            studio.add_curve('gamma', 2.2)
+            studio.add_curve('contrast', 1.3)
+            studio.auto_levels = True
+        self.assertEqual(lut_studio.render(new_width=60), reference_studio.render(new_width=60))
+        self.assertEqual(''.join(lut_studio.render_iter(new_width=61, band_rows=3)), reference_studio.render(new_width=61))
+
+        # The invert curve matches rendering an inverted copy of the resized image, and changing the
+        # curves invalidates cached renders.
+        self.studio.load('stadshuset.jpg')
+        plain = self.studio.render(new_width=40)
+        self.studio.add_curve('invert')
+        inverted_image = ImageChops.invert(self.studio._resize_image(40))
+        self.assertEqual(self.studio.render(new_width=40), ASCII_Art_Studio()._convert_to_ascii(inverted_image))
+        self.studio.clear_curves()
+        self.assertEqual(self.studio.render(new_width=40), plain)
+        with self.assertRaises(ValueError):
+            self.studio.add_curve('gamma')
+        with self.assertRaises(ValueError):
+            self.studio.set_ramp('missing')
+
+    def test_register_curve_invalidates_tables_and_renders(self):
+        """Test that replacing a registered curve rebuilds tables and renders, and that built-in curves are protected."""
+        from ASCII_Art_Studio import TONE_CURVES, register_curve
+        with self.assertRaises(ValueError):
+            register_curve('gamma', lambda: lambda value: value)
+        studio = ASCII_Art_Studio(render_cache=Render_Cache())
+        studio.load('stadshuset.jpg')
+        plain = studio.render(new_width=30)
+        try:
+            register_curve('test_curve', lambda: lambda value: value)
+            studio.add_curve('test_curve')
+            self.assertEqual(studio.render(new_width=30), plain)
+            register_curve('test_curve', lambda: lambda value: 255 - value)
+            inverting_studio = ASCII_Art_Studio()
+            inverting_studio.load('stadshuset.jpg')
+            inverting_studio.add_curve('invert')
+            self.assertEqual(studio.render(new_width=30), inverting_studio.render(new_width=30))
+        finally:
+            del TONE_CURVES['test_curve']
+
+    def test_equivalence_harness(self):
+        """Test that every engine matches the reference on synthetic images and that a divergent engine is located."""
+        report = run_equivalence(count=60, seed=7)
+        self.assertEqual(report['mismatches'], {})
+        self.assertEqual(set(report['seconds']), {'reference', 'lut', 'bands'})
+
+        class Rounding_Studio(ASCII_Art_Studio):
+            # An engine rounding to the nearest ramp character instead of truncating like the reference.
+            RENDER_ENGINES = dict(ASCII_Art_Studio.RENDER_ENGINES, rounding='_convert_to_ascii_rounding')
+
+            def _convert_to_ascii_rounding(self, image, levels=None):
+                lut = bytes(ord(self.ascii_chars[round(value / 256 * (len(self.ascii_chars) - 1))]) for value in range(256))
+                return ''.join(image.tobytes()[row * image.width:(row + 1) * image.width].translate(lut).decode('ascii') + '\n'
+                               for row in range(image.height))
+
+        mismatch = run_equivalence(count=1, studio_class=Rounding_Studio)['mismatches']['rounding']
+        # The first case uses the default settings, so the reported cell can be checked against `_get_ascii_char`.
+        self.assertEqual((mismatch['case'], mismatch['row']), (0, 0))
+        self.assertEqual(ASCII_Art_Studio()._get_ascii_char(mismatch['gray_value']), mismatch['expected'])
+        self.assertNotEqual(mismatch['actual'], mismatch['expected'])
+
+    def test_unknown_render_engine(self):
+        """Test that selecting an unknown rendering engine is rejected."""
+        with self.assertRaises(ValueError):
+            ASCII_Art_Studio(engine='nonexistent')
+
+    def test_lazy_load_defers_decoding(self):
+        """Test that lazy loading reports the original size and decodes only a reduced image on render."""
+        eager_studio = ASCII_Art_Studio()
+        eager_studio.load('grayscale.jpg')
+        lazy_studio = ASCII_Art_Studio(lazy=True)
+        self.assertEqual(lazy_studio.load('grayscale.jpg'), "Image loaded successfully.")
+        self.assertIsNone(lazy_studio.current_image)
+        self.assertEqual(lazy_studio.info(), eager_studio.info())
+
+        lines = lazy_studio.render(new_width=50).splitlines()
+        self.assertEqual(len(lines), len(eager_studio.render(new_width=50).splitlines()))
+        self.assertTrue(all(len(line) == 50 for line in lines))
+        # The decode kept for re-rendering is far smaller than the 2000x1500 original and is reused
+        # for narrower renders.
+        draft = lazy_studio._draft_image
+        self.assertLess(draft.width, 2000)
+        lazy_studio.render(new_width=40)
+        self.assertIs(lazy_studio._draft_image, draft)
+
+    def test_render_cache_hits_and_invalidation(self):
+        """Test that repeated renders are cached and that loading another image invalidates them."""
+        self.studio.load('stadshuset.jpg')
+        first = self.studio.render(new_width=50)
+        self.assertEqual(self.studio.render(new_width=50), first)
+        self.studio.render(new_width=60)
+        stats = self.studio.render_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 2, 2))
+
+        self.studio.load('slalom.jpg')
+        self.assertEqual(len(self.studio.render_cache), 0)
+
+    def test_render_cache_limits(self):
+        """Test that the render cache evicts least recently used entries to respect both limits."""
+        cache = Render_Cache(max_entries=2, max_bytes=10)
+        cache.put(('a',), '1234')
+        cache.put(('b',), '1234')
+        cache.get(('a',))
+        cache.put(('c',), '1234')
+        self.assertIsNone(cache.get(('b',)))
+        cache.put(('d',), '12345')
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.total_bytes, 10)
+        cache.put(('e',), '12345678901')
+        self.assertIsNone(cache.get(('e',)))
+        self.assertEqual(cache.stats()['evictions'], 2)
+
+    def test_render_iter_and_render_to(self):
+        """Test that streaming renders yield bounded bands that add up to the complete render."""
+        self.studio.load('grayscale.jpg')
+        cached_studio = ASCII_Art_Studio(render_cache=Render_Cache())
+        cached_studio.load('grayscale.jpg')
+        bands = list(cached_studio.render_iter(new_width=300, band_rows=16))
+        self.assertEqual(len(cached_studio.render_cache), 0)  # Streaming never holds the whole render
+        self.assertTrue(all(band.count('\n') <= 16 for band in bands))
+        self.assertEqual(''.join(bands), self.studio.render(new_width=300))
+
+        stream = io.BytesIO()
+        bytes_written = self.studio.render_to(stream, new_width=120, band_rows=7)
+        self.assertEqual(stream.getvalue().decode('ascii'), self.studio.render(new_width=120))
+        self.assertEqual(bytes_written, len(stream.getvalue()))
+
+        with self.assertRaises(ValueError):
+            list(ASCII_Art_Studio().render_iter())
+
+    def test_line_delta_writer(self):
+        """Test that only the lines that changed since the previous screen are redrawn."""
+        stream = io.BytesIO()
+        writer = Line_Delta_Writer(stream)
+        self.assertEqual(writer.draw(['@@@@', '....', '####']), 3)
+        self.assertEqual(writer.draw(['@@@@', '.##.', '####']), 1)
+        self.assertEqual(writer.draw(['@@@@', '.##.', '####']), 0)
+        self.assertEqual(writer.draw(['@@@@']), 2)
+        self.assertIn(b'\x1b[2;1H.##.\x1b[K', stream.getvalue())
+
+    def test_animation_playback(self):
+        """Test that every frame of an animated GIF is rendered and played at the frame durations of the source."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, 'animation.gif')
+            frames = [Image.new('L', (40, 40), gray) for gray in (0, 64, 128, 255)]
+            frames[0].save(filename, save_all=True, append_images=frames[1:], duration=50, loop=0)
+            self.studio.load(filename)
+            self.assertIn("Frames: 4", self.studio.info())
+
+            # A fake clock that only advances while the player sleeps keeps the test deterministic.
+            now = [0.0]
+            stream = io.BytesIO()
+            player = Animation_Player(self.studio, stream, new_width=20, loops=2,
+                                      clock=lambda: now[0], sleep=lambda seconds: now.__setitem__(0, now[0] + seconds))
+            stats = player.play()
+            single_loop = Animation_Player(self.studio, io.BytesIO(), new_width=20, loops=1,
+                                           clock=lambda: now[0], sleep=lambda seconds: now.__setitem__(0, now[0] + seconds))
+            self.assertEqual(single_loop.play()['frames'], 4)
+
+            def interrupt(seconds):
+                raise KeyboardInterrupt
+            interrupted = Animation_Player(self.studio, io.BytesIO(), new_width=20, loops=3,
+                                           clock=lambda: now[0], sleep=interrupt).play()
+            self.assertEqual((interrupted['frames'], interrupted['shown']), (2, 1))
+        self.assertEqual((stats['frames'], stats['shown'], stats['dropped']), (8, 8, 0))
+        self.assertAlmostEqual(stats['elapsed'], 0.4)
+        self.assertEqual(len(stats['render_ms']), 8)
+        self.assertEqual(stats['bytes_written'], len(stream.getvalue()))
+
+    def test_image_watcher_redraws_changed_bands(self):
+        """Test that the watcher ignores unchanged files and only re-renders the bands of a changed region."""
+        with tempfile.TemporaryDirectory() as watch_directory:
+            filename = os.path.join(watch_directory, 'dashboard.png')
+            image = Image.linear_gradient('L').resize((200, 160))
+            image.save(filename)
+            stream = io.BytesIO()
+            watcher = Image_Watcher(self.studio, filename, stream, new_width=40)
+            self.assertEqual(watcher.poll(), 17)  # Every line of the 40x17 picture
+            self.assertEqual(watcher.poll(), None)
+            self.assertEqual(watcher.stats['updates'], 1)
+            full_band_count = watcher.stats['bands_rendered']
+
+            # Darken the bottom of the picture and make sure the change is seen even within one mtime tick.
+            image.paste(0, (0, 140, 200, 160))
+            image.save(filename)
+            os.utime(filename, ns=(0, 0))
+            written_before = len(stream.getvalue())
+            redrawn = watcher.poll()
+            self.assertGreater(redrawn, 0)
+            self.assertLess(redrawn, 17)
+            self.assertLess(watcher.stats['bands_rendered'] - full_band_count, full_band_count)
+            self.assertEqual(watcher._lines, self.studio.render(new_width=40).splitlines())
+            self.assertGreater(len(stream.getvalue()), written_before)
+
+    def test_benchmark_regression_check(self):
+        """Test that the benchmark times every stage and flags stages slower than the baseline threshold."""
+        report = run_benchmarks(images=['test_100x50.jpg'], synthetic_sizes=[], widths=[20], repeats=1)
+        stages = [entry['stage'] for entry in report['results']]
+        self.assertEqual(stages, ['load', '_resize_image', '_convert_to_ascii', 'render'])
+        if resource is not None:
+            # Every stage runs in a fresh process, whose peak includes at least the decoded image.
+            self.assertTrue(all(entry['peak_rss_bytes'] > 100 * 50 for entry in report['results']))
+        self.assertEqual(len(format_results(report).splitlines()), 5)
+        self.assertEqual(compare_results(report, report, threshold_percent=10), [])
+
+        baseline = {'results': [dict(entry, seconds=entry['seconds'] / 2) for entry in report['results']]}
+        regressions = compare_results(baseline, report, threshold_percent=10)
+        self.assertEqual([regression['stage'] for regression in regressions], stages)
+
+    def test_stage_instrumentation(self):
+        """Test that enabled instrumentation records every pipeline stage and disabled instrumentation records nothing."""
+        self.assertIsNone(self.studio.stats)
+        studio = ASCII_Art_Studio(instrument=True)
+        studio.load('stadshuset.jpg')
+        studio.render_to(io.BytesIO(), new_width=40)
+        stages = studio.stats.as_dict()['stages']
+        self.assertEqual(list(stages), ['decode', 'grayscale', 'resize', 'map', 'print'])
+        self.assertEqual(stages['decode']['pixels'], 640 * 426)
+        self.assertEqual(stages['map']['bytes'], len(studio.render(new_width=40)))
+        self.assertEqual(sum(stages['resize']['histogram']), stages['resize']['count'])
+
+    def test_pyramid_resize_within_tolerance(self):
+        """Test that resizing from the mip pyramid keeps the dimensions and stays close to the direct resize."""
+        pyramid_studio = ASCII_Art_Studio(pyramid=True)
+        for filename in ('stadshuset.jpg', 'slalom.jpg', 'grayscale.jpg'):
+            self.studio.load(filename)
+            pyramid_studio.load(filename)
+            for width in (10, 40, 120, 300):
+                direct = self.studio._resize_image(width)
+                from_pyramid = pyramid_studio._resize_image(width)
+                self.assertEqual(from_pyramid.size, direct.size)
+                mean_error = ImageStat.Stat(ImageChops.difference(direct, from_pyramid)).mean[0]
+                self.assertLessEqual(mean_error, PYRAMID_MAX_MEAN_ERROR)
+            # Levels are built only as far down as the narrowest render needed.
+            self.assertLess(pyramid_studio._pyramid_levels[-1].width, 10 * 8 * 2)
+
+    def test_render_color(self):
+        """Test that colored renders keep the plain characters and merge equal colors into one escape."""
+        studio = ASCII_Art_Studio(color=True)
+        studio.load('slalom.jpg')
+        self.assertEqual(studio.color_image.mode, 'RGB')
+        for palette in ('truecolor', 'color256'):
+            colored_art = studio.render_color(new_width=80, palette=palette)
+            self.assertEqual(re.sub('\x1b\\[[0-9;]*m', '', colored_art), studio.render(new_width=80))
+            stats = studio.last_color_stats
+            self.assertEqual(stats['bytes'], len(colored_art))
+            self.assertLess(stats['runs'], stats['cells'])
+
+        # A uniform image needs a single color run per line.
+        studio.color_image = Image.new('RGB', studio.color_image.size, (200, 30, 30))
+        studio.render_color(new_width=80, palette='color256')
+        self.assertEqual(studio.last_color_stats['runs'], studio._resize_image(80).height)
+
+    @unittest.skipUnless(importlib.util.find_spec('numpy'), "the glyph render mode requires NumPy")
+    def test_render_glyph(self):
+        """Test that glyph matching keeps the render dimensions, caches its index on disk and maps flat tones sensibly."""
+        with tempfile.TemporaryDirectory() as index_directory:
+            self.studio.glyph_index_directory = index_directory
+            self.studio.load('stadshuset.jpg')
+            glyph_art = self.studio.render_glyph(new_width=60)
+            self.assertEqual([len(line) for line in glyph_art.splitlines()],
+                             [len(line) for line in self.studio.render(new_width=60).splitlines()])
+            self.assertTrue(set(glyph_art) <= set(GLYPH_CHARACTERS + '\n'))
+            self.assertEqual(len(os.listdir(index_directory)), 1)
+
+            # A white image is drawn with spaces only.
+            self.studio.current_image = Image.new('L', (100, 100), 255)
+            self.assertEqual(set(self.studio.render_glyph(new_width=20)), {' ', '\n'})
+
+    def test_tiled_render_matches_single_process(self):
+        """Test that the tiled multi-process render is identical to the single-process render."""
+        renderer = Tiled_Renderer(workers=2, tile_rows=37)
+        self.assertEqual(renderer.render(self.studio), "No image loaded to render.")
+        self.studio.load('grayscale.jpg')
+        for width in (23, 160, 2500):
+            self.assertEqual(renderer.render(self.studio, new_width=width), self.studio.render(new_width=width))
+        pyramid_studio = ASCII_Art_Studio(pyramid=True)
+        pyramid_studio.load('stadshuset.jpg')
+        pyramid_studio.add_curve('gamma', 0.7)
+        pyramid_studio.auto_levels = True
+        self.assertEqual(renderer.render(pyramid_studio, new_width=90), pyramid_studio.render(new_width=90))
+
+    def test_tiled_render_file_above_bomb_limit(self):
+        """
+        Test that the tiled path renders a file above Pillow's decompression bomb limit, which the studio
+        refuses to load, exactly like a regular render, and that the limit is restored afterwards.
+        """
+        renderer = Tiled_Renderer(workers=2, tile_rows=37)
+        self.studio.load('stadshuset.jpg')
+        self.studio.add_curve('contrast', 1.5)
+        expected = self.studio.render(new_width=70)
+        with patch.object(Image, 'MAX_IMAGE_PIXELS', 1000):
+            # 640x426 pixels is more than twice the limit, so Pillow raises instead of warning.
+            self.assertTrue(ASCII_Art_Studio().load('stadshuset.jpg').startswith("An unexpected error occurred"))
+            self.assertEqual(renderer.render_file(self.studio, 'stadshuset.jpg', new_width=70), expected)
+            self.assertEqual(Image.MAX_IMAGE_PIXELS, 1000)
+        with self.assertRaises(FileNotFoundError):
+            renderer.render_file(self.studio, 'missing.jpg')
+
+    def test_luminance_grid_round_trip(self):
+        """Test that a saved luminance grid renders exactly like the image with the default and a custom ramp."""
+        self.assertEqual(self.studio.save_grid('unused.aasg'), "No image loaded to save.")
+        self.studio.load('stadshuset.jpg')
+        with tempfile.TemporaryDirectory() as grid_directory:
+            grid_path = os.path.join(grid_directory, 'stadshuset.aasg')
+            self.assertEqual(self.studio.save_grid(grid_path, new_width=70), "Luminance grid saved successfully.")
+            with Luminance_Grid(grid_path) as grid:
+                self.assertEqual(grid.source_size, self.studio.current_image.size)
+                self.assertEqual(grid.render(), self.studio.render(new_width=70))
+                inverted = grid.render(' .:-=+*#%@')
+            self.assertEqual(inverted, self.studio.render(new_width=70).translate(
+                str.maketrans('@%#*+=-:. ', ' .:-=+*#%@')))
+
+            with open(os.path.join(grid_directory, 'not_a_grid.aasg'), 'wb') as bad_file:
+                bad_file.write(b'not a grid file at all, just some text' * 4)
+            with self.assertRaises(ValueError):
+                Luminance_Grid(bad_file.name)
+
+    def test_workspace_evicts_least_recently_used(self):
+        """Test that the workspace keeps decoded images within its budget and decodes evicted ones again on use."""
+        workspace = Image_Workspace(max_bytes=400 * 1024)
+        self.assertEqual(workspace.load('city', 'stadshuset.jpg'), "Image loaded successfully.")
+        city_art = workspace.use('city').render(new_width=40)
+        workspace.load('slope', 'slalom.jpg')  # 640x426 + 728x485 grayscale bytes exceed the budget
+        self.assertEqual([(entry['name'], entry['resident']) for entry in workspace.entries()],
+                         [('city', False), ('slope', True)])
+        self.assertLessEqual(workspace.total_bytes(), workspace.max_bytes)
+
+        studio = workspace.use('city')
+        self.assertEqual(workspace.reloads, 1)
+        self.assertEqual(studio.render(new_width=40), city_art)
+        # The active image stays resident even when it alone exceeds the budget.
+        workspace.max_bytes = 0
+        workspace.enforce_budget()
+        self.assertEqual([entry['resident'] for entry in workspace.entries()], [False, True])
+        with self.assertRaises(KeyError):
+            workspace.use('missing')
+
     def run(self, result=None):
         # Add a custom header before each test
         test_id = self.id().split('.')[-1]
@@ -179,6 +551,105 @@ class Test_ASCII_Art_Studio(unittest.TestCase):
         else:
             print("Test Case {} Passed".format(test_id))
 
+class Test_Render_Server(unittest.TestCase):
+    """
+    Test case for the Render_Server class, exercising the HTTP endpoints against localhost.
+    """
+
+    def start_server(self, **options):
+        """
+        Start a server on a free localhost port and return a keep-alive connection to it.
+        """
+        server = Render_Server(port=0, workers=2, **options)
+        port = server.start_in_thread()
+        self.addCleanup(server.stop)
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        self.addCleanup(connection.close)
+        return server, connection
+
+    def request(self, connection, method, target, body=None):
+        """
+        Send one request over the connection and return the status and decoded body of the response.
+        """
+        connection.request(method, target, body)
+        response = connection.getresponse()
+        return response.status, response.read().decode()
+
+    def test_render_endpoints_share_cache(self):
+        """
+        Test that POST and GET renders match the studio output and that repeated renders hit the shared cache.
+        """
+        server, connection = self.start_server()
+        studio = ASCII_Art_Studio()
+        studio.load('stadshuset.jpg')
+        with open('stadshuset.jpg', 'rb') as image_file:
+            image_bytes = image_file.read()
+
+        self.assertEqual(self.request(connection, 'POST', '/render?width=50', image_bytes), (200, studio.render(new_width=50)))
+        self.assertEqual(self.request(connection, 'POST', '/render?width=50', image_bytes), (200, studio.render(new_width=50)))
+        # Cached images keep no reference to the request body they were decoded from.
+        self.assertTrue(all(isinstance(entry[0].filename, str) for entry in server._images.values()))
+        self.assertEqual(self.request(connection, 'GET', '/render?path=stadshuset.jpg&width=30'),
+                         (200, studio.render(new_width=30)))
+        self.assertEqual(self.request(connection, 'GET', '/render?path=../etc/passwd')[0], 404)
+        self.assertEqual(self.request(connection, 'POST', '/render', b'not an image')[0], 400)
+
+        status, body = self.request(connection, 'GET', '/metrics')
+        metrics = json.loads(body)
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics['render_cache']['hits'], 1)
+        self.assertEqual(metrics['requests'], 5)
+        self.assertIn('p99', metrics['latency_ms'])
+
+    def test_decoded_images_within_byte_budget(self):
+        """
+        Test that decoded images are evicted to respect the byte budget and that a malformed Content-Length gets a 400.
+        """
+        server, connection = self.start_server(image_cache_max_bytes=640 * 426)
+        self.assertEqual(self.request(connection, 'GET', '/render?path=stadshuset.jpg&width=20')[0], 200)
+        self.assertEqual(self.request(connection, 'GET', '/render?path=slalom.jpg&width=20')[0], 200)
+        metrics = json.loads(self.request(connection, 'GET', '/metrics')[1])
+        self.assertEqual(metrics['decoded_images'], 1)
+        self.assertEqual(metrics['decoded_image_bytes'], 728 * 485)  # Only slalom.jpg, in grayscale
+
+        connection.putrequest('POST', '/render')
+        connection.putheader('Content-Length', 'many')
+        connection.endheaders()
+        self.assertEqual(connection.getresponse().status, 400)
+
+    def test_stop_closes_kept_alive_connections(self):
+        """
+        Test that stopping the server ends the connections still kept alive without logging errors.
+        """
+        server, connection = self.start_server()
+        self.assertEqual(self.request(connection, 'GET', '/metrics')[0], 200)
+        self.assertEqual(len(server._connections), 1)
+        with self.assertNoLogs('asyncio', level='ERROR'):
+            server.stop()
+        self.assertEqual(server._connections, {})
+
+    def test_overload_returns_503(self):
+        """
+        Test that renders beyond the pending limit are rejected with 503 while metrics stay available.
+        """
+        server, connection = self.start_server(max_pending=0)
+        self.assertEqual(self.request(connection, 'GET', '/render?path=stadshuset.jpg')[0], 503)
+        self.assertEqual(self.request(connection, 'GET', '/metrics')[0], 200)
+
+    def run(self, result=None):
+        # Custom header before each test
+        test_id = self.id().split('.')[-1]
+        print("\nRunning Test Case: {}".format(test_id))
+        super(Test_Render_Server, self).run(result)  # Run the actual test
+        # Custom footer after each test
+        print("Finished Test Case: {}\n".format(test_id))
+        if result.failures:
+            print("Test Case {} Failed: {}".format(test_id, result.failures[-1][1]))
+        elif result.errors:
+            print("Test Case {} Encountered an Error: {}".format(test_id, result.errors[-1][1]))
+        else:
+            print("Test Case {} Passed".format(test_id))
+
 class Test_User_Interface(unittest.TestCase):
     """
     Test case for the User_Interface class, covering functionalities like handling user commands.
@@ -218,6 +689,141 @@ class Test_User_Interface(unittest.TestCase):
             self.ui.run()
             mock_print.assert_any_call("No image loaded")
 
+    @patch('builtins.print')
+    def test_batch_command(self, mock_print):
+        """
+        Test the batch command renders matching files in parallel and collects per-file errors in the summary.
+        """
+        with tempfile.TemporaryDirectory() as output_dir:
+            summary = Batch_Renderer(workers=2).run('*.jp*g', 40, output_dir)
+            self.assertEqual(summary['failed'], 0)
+            self.assertEqual(summary['rendered'], summary['matched'])
+            with open(os.path.join(output_dir, 'stadshuset.jpg.txt')) as output_file:
+                self.studio.load('stadshuset.jpg')
+                self.assertEqual(output_file.read(), self.studio.render(new_width=40))
+
+            with patch('builtins.input', side_effect=[f'batch incorrect_format.* 40 {output_dir}', 'quit']):
+                self.ui.run()
+            mock_print.assert_any_call("incorrect_format.txt: An IOError occurred: "
+                                       "The file may not be accessible or may have an incorrect format..")
+
+    def test_batch_keeps_subdirectories_apart(self):
+        """
+        Test that files sharing a name in different subdirectories matched by '**' get separate outputs.
+        """
+        with tempfile.TemporaryDirectory() as work_dir:
+            for subdirectory, source in (('a', 'stadshuset.jpg'), ('b', 'slalom.jpg')):
+                os.makedirs(os.path.join(work_dir, 'images', subdirectory))
+                shutil.copy(source, os.path.join(work_dir, 'images', subdirectory, 'x.jpg'))
+            output_dir = os.path.join(work_dir, 'out')
+            summary = Batch_Renderer(workers=1).run(os.path.join(work_dir, 'images', '**', '*.jpg'), 30, output_dir)
+            self.assertEqual((summary['rendered'], summary['failed']), (2, 0))
+            for subdirectory, source in (('a', 'stadshuset.jpg'), ('b', 'slalom.jpg')):
+                self.studio.load(source)
+                with open(os.path.join(output_dir, subdirectory, 'x.jpg.txt')) as output_file:
+                    self.assertEqual(output_file.read(), self.studio.render(new_width=30))
+
+    @patch('builtins.print')
+    def test_workspace_commands(self, mock_print):
+        """
+        Test that named images can be loaded, listed and switched between, and that info reports the workspace.
+        """
+        with patch('builtins.input', side_effect=['list', 'load city stadshuset.jpg', 'load slope slalom.jpg',
+                                                  'use city', 'use nothing', 'info', 'quit']):
+            self.ui.run()
+        mock_print.assert_any_call("No named images. Please use the command as: load <name> <filename>")
+        mock_print.assert_any_call("Using 'city' (stadshuset.jpg).")
+        mock_print.assert_any_call("No image named 'nothing'. Use 'list' to see the loaded images.")
+        mock_print.assert_any_call("Filename: stadshuset.jpg\nSize: (640, 426)")
+        self.assertEqual(self.ui.art_studio.filename, 'stadshuset.jpg')
+        self.assertIs(self.ui.art_studio.render_cache, self.studio.render_cache)
+        workspace_report = mock_print.call_args_list[-2][0][0]
+        self.assertIn("Workspace: 2 images, 2 resident, 0 evicted", workspace_report)
+
+    @patch('builtins.print')
+    def test_unnamed_load_keeps_named_image(self, mock_print):
+        """
+        Test that loading without a name after a named load leaves the named image in the workspace.
+        """
+        self.assertEqual(self.ui.run_script("load city stadshuset.jpg; load slalom.jpg"), 0)
+        self.assertEqual(self.ui.art_studio.filename, 'slalom.jpg')
+        self.assertEqual([(entry['name'], entry['filename'], entry['active']) for entry in self.ui.workspace.entries()],
+                         [('city', 'stadshuset.jpg', False)])
+        self.assertEqual(self.ui.run_script("use city"), 0)
+        self.assertEqual(self.ui.art_studio.filename, 'stadshuset.jpg')
+
+    @patch('builtins.print')
+    def test_workspace_keeps_tone_pipeline(self, mock_print):
+        """
+        Test that the ramp, tone curves and auto-levels chosen in the session apply to named images too.
+        """
+        self.assertEqual(self.ui.run_script("ramp binary; curve invert; curve auto; load a stadshuset.jpg; "
+                                            "load b slalom.jpg; use a"), 0)
+        studio = self.ui.art_studio
+        self.assertEqual(studio.filename, 'stadshuset.jpg')
+        self.assertEqual((studio.ramp, studio.ascii_chars, studio.curves, studio.auto_levels),
+                         ('binary', '# ', [('invert', ())], True))
+
+    @patch('builtins.print')
+    def test_ramp_command_keeps_spaces(self, mock_print):
+        """
+        Test that registered ramps may contain spaces, kept at their ends when quoted, and that built-in
+        ramps cannot be redefined.
+        """
+        from ASCII_Art_Studio import CHARACTER_RAMPS
+        self.assertTrue(self.ui.execute('ramp test_spaced # = .'))
+        self.assertEqual(self.ui.art_studio.ascii_chars, '# = .')
+        self.assertTrue(self.ui.execute('ramp test_quoted "#=-. "'))
+        self.assertEqual(self.ui.art_studio.ascii_chars, '#=-. ')
+        self.assertFalse(self.ui.execute('ramp default #.'))
+        self.assertEqual(CHARACTER_RAMPS['default'], "@%#*+=-:. ")
+        self.assertEqual(self.ui.art_studio.ramp, 'test_quoted')
+        for name in ('test_spaced', 'test_quoted'):
+            del CHARACTER_RAMPS[name]
+
+    @patch('builtins.print')
+    def test_script_mode(self, mock_print):
+        """
+        Test that scripts run without prompts, stop at the first failing command with status 1, and that
+        'help' and 'info' run without importing Pillow.
+        """
+        ui = User_Interface()
+        self.assertEqual(ui.run_script("help; info\n# a comment\n\n"), 0)
+        mock_print.assert_any_call("No image loaded")
+        self.assertIsNone(ui._art_studio)
+        self.assertEqual(ui.run_script("load stadshuset.jpg\nload missing.jpg; info"), 1)
+        mock_print.assert_any_call("Script stopped at line 2: load missing.jpg", file=sys.stderr)
+        self.assertNotIn(unittest.mock.call("Filename: stadshuset.jpg\nSize: (640, 426)"), mock_print.call_args_list)
+
+        check = "import sys, User_Interface; User_Interface.User_Interface().run_script('help; info'); " \
+                "print('PIL' in sys.modules)"
+        output = subprocess.run([sys.executable, '-c', check], capture_output=True, text=True, check=True).stdout
+        self.assertTrue(output.endswith("False\n"))
+
+        # The command line renders exactly as the studio does unless the pyramid is asked for.
+        command = [sys.executable, 'User_Interface.py', '-c', 'load stadshuset.jpg; render 50']
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        self.ui.art_studio.load('stadshuset.jpg')
+        self.assertEqual(output, f"Image loaded successfully.\n{self.ui.art_studio.render(new_width=50)}\n")
+        command.insert(2, '--pyramid')
+        self.assertEqual(subprocess.run(command, capture_output=True, text=True).returncode, 0)
+
+    @patch('builtins.print')
+    def test_stats_command(self, mock_print):
+        """
+        Test the stats command reports disabled instrumentation and exports recorded timings as JSON.
+        """
+        with tempfile.TemporaryDirectory() as output_dir:
+            json_path = os.path.join(output_dir, 'stats.json')
+            with patch('builtins.input', side_effect=['stats', 'stats on', 'load stadshuset.jpg',
+                                                      f'stats json {json_path}', 'quit']):
+                self.ui.run()
+            with open(json_path) as json_file:
+                report = json.load(json_file)
+        mock_print.assert_any_call("Stage timing is disabled. Use 'stats on' to enable it.")
+        self.assertEqual(list(report['stages']), ['decode', 'grayscale'])
+        self.assertIn('render_cache', report)
+
     def run(self, result=None):
         # Custom header before each test
         test_id = self.id().split('.')[-1]
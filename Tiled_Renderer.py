@@ -0,0 +1,236 @@
+# Tiled_Renderer.py
+
+# Renders very large images with a pool of worker processes. The pixel data is exchanged through
+# shared memory blocks, so neither the source raster nor the intermediate results are ever pickled.
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+import os
+
+from PIL import Image
+
+from ASCII_Art_Studio import ASCII_ART_WIDTH_IN_CHARACTERS
+
+# Source rows resampled horizontally by one task.
+TILE_ROWS = 256
+
+# Output columns resampled vertically by one task, at the least.
+MIN_TILE_COLUMNS = 16
+
+# Tasks per worker process in each phase, so that uneven tiles still keep every worker busy.
+TILES_PER_WORKER = 4
+
+@contextmanager
+def _unlimited_image_pixels():
+    # Lifts Pillow's decompression bomb limit, a module global, for the duration of the block.
+    max_image_pixels = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = None
+    try:
+        yield
+    finally:
+        Image.MAX_IMAGE_PIXELS = max_image_pixels
+
+def _lift_image_pixel_limit():
+    # Worker process initializer: the workers only handle images the parent has already accepted.
+    Image.MAX_IMAGE_PIXELS = None
+
+def _attach(name):
+    # Attaches to a shared memory block created by the parent process.
+    return shared_memory.SharedMemory(name=name)
+
+def _resample_rows(source_name, source_width, top, bottom, width, intermediate_name):
+    """
+    Resample rows `top` to `bottom` of the source horizontally to `width` columns. This runs inside a worker process.
+
+    Parameters:
+    - source_name: str, the shared memory block holding the grayscale source, row by row.
+    - source_width: int, the width of the source in pixels.
+    - top, bottom: int, the first and the end row of the tile.
+    - width: int, the width of the output in characters.
+    - intermediate_name: str, the shared memory block receiving the resampled rows, `width` bytes per row.
+    """
+    source_memory = _attach(source_name)
+    intermediate_memory = _attach(intermediate_name)
+    try:
+        rows = source_memory.buf[top * source_width:bottom * source_width]
+        strip = Image.frombuffer('L', (source_width, bottom - top), rows, 'raw', 'L', 0, 1)
+        # Only the width changes, so Pillow runs just the horizontal pass of the resize, with the same
+        # coefficients as for the whole image.
+        resampled = strip.resize((width, bottom - top)).tobytes()
+        del strip
+        rows.release()
+        intermediate_memory.buf[top * width:bottom * width] = resampled
+    finally:
+        source_memory.close()
+        intermediate_memory.close()
+
+def _resample_columns(intermediate_name, width, source_height, left, right, height, output_name):
+    """
+    Resample columns `left` to `right` of the horizontally resampled image vertically to `height` rows.
+    This runs inside a worker process.
+
+    Parameters:
+    - intermediate_name: str, the shared memory block holding the horizontally resampled image.
+    - width: int, the width of the output in characters.
+    - source_height: int, the height of the source in pixels.
+    - left, right: int, the first and the end column of the tile.
+    - height: int, the height of the output in lines.
+    - output_name: str, the shared memory block receiving the resized image, `width` bytes per row.
+    """
+    intermediate_memory = _attach(intermediate_name)
+    output_memory = _attach(output_name)
+    try:
+        view = intermediate_memory.buf[:width * source_height]
+        columns = Image.frombuffer('L', (width, source_height), view, 'raw', 'L', 0, 1).crop((left, 0, right, source_height))
+        view.release()
+        # Only the height changes, so Pillow runs just the vertical pass of the resize.
+        tile_width = right - left
+        resized = columns.resize((tile_width, height)).tobytes()
+        output = output_memory.buf
+        for row in range(height):
+            start = row * width + left
+            output[start:start + tile_width] = resized[row * tile_width:(row + 1) * tile_width]
+        del output
+    finally:
+        intermediate_memory.close()
+        output_memory.close()
+
+class Tiled_Renderer:
+    """
+    Renders the image of an ASCII_Art_Studio with a pool of worker processes. Pillow resizes in two
+    separable passes, and the renderer splits each pass where it is independent: the horizontal pass
+    over tiles of source rows, the vertical pass over tiles of output columns. Every tile therefore
+    computes exactly what the single-process resize computes. The stitched image is then mapped to
+    characters by the studio in a single table lookup pass, so the result is identical to
+    `ASCII_Art_Studio.render` with any ramp and tone curves.
+    """
+
+    def __init__(self, workers=None, tile_rows=TILE_ROWS):
+        """
+        Initialize the tiled renderer.
+
+        Parameters:
+        - workers: int, the number of worker processes; defaults to the number of CPUs.
+        - tile_rows: int, the number of source rows resampled by one task.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.tile_rows = tile_rows
+
+    def _column_tiles(self, width):
+        # Splits the output columns into about `TILES_PER_WORKER` tiles per worker.
+        tile_columns = max(MIN_TILE_COLUMNS, -(-width // (self.workers * TILES_PER_WORKER)))
+        return [(left, min(left + tile_columns, width)) for left in range(0, width, tile_columns)]
+
+    def _row_tiles(self, height):
+        # Splits the source rows into tiles of `tile_rows` rows.
+        return [(top, min(top + self.tile_rows, height)) for top in range(0, height, self.tile_rows)]
+
+    def render(self, art_studio, new_width=ASCII_ART_WIDTH_IN_CHARACTERS):
+        """
+        Render the image loaded in a studio as ASCII art. The studio keeps its decoded image, so while
+        the workers run the source is held twice: by the studio and in shared memory. Use `render_file`
+        for images too large for that, or too large for `ASCII_Art_Studio.load` to accept at all.
+
+        Parameters:
+        - art_studio: ASCII_Art_Studio, the studio holding the image; its lazy and pyramid settings apply.
+        - new_width: int, the width of the ASCII art in characters.
+
+        Returns:
+        - str, the ASCII art, identical to `art_studio.render(new_width)`, or an error message if no image is loaded.
+        """
+        if not art_studio.has_image():
+            return "No image loaded to render."
+        width, height = art_studio._target_size(new_width)
+        if width <= 0 or height <= 0:
+            return art_studio.render(new_width=new_width)  # Reports the same error as a single-process render
+        source = art_studio._resample_source((width, height))
+        source_memory = shared_memory.SharedMemory(create=True, size=source.width * source.height)
+        try:
+            for top, bottom in self._row_tiles(source.height):
+                # Copied tile by tile, so that the only full-size copy made is the shared block itself.
+                source_memory.buf[top * source.width:bottom * source.width] = \
+                    source.crop((0, top, source.width, bottom)).tobytes()
+        except BaseException:
+            source_memory.close()
+            source_memory.unlink()
+            raise
+        return self._render_shared(art_studio, source_memory, source.size, (width, height))
+
+    def render_file(self, art_studio, filename, new_width=ASCII_ART_WIDTH_IN_CHARACTERS):
+        """
+        Render an image file as ASCII art without loading it into the studio. This is the path for
+        gigapixel images: Pillow's decompression bomb limit is lifted while the file is opened, and
+        the decoded image is converted to grayscale band by band straight into shared memory and
+        released before the worker processes start, so that during the resize the parent holds the
+        grayscale source only once.
+
+        Parameters:
+        - art_studio: ASCII_Art_Studio, the studio whose character ramp and tone curves apply.
+        - filename: str, the path to the image file.
+        - new_width: int, the width of the ASCII art in characters.
+
+        Returns:
+        - str, the ASCII art, identical to loading the file into the studio and rendering it.
+
+        Raises:
+        - IOError: if the file cannot be opened or decoded.
+        - ValueError: if the width is too small for the image to have at least one line.
+        """
+        # The limit is a module global of Pillow, so it is only lifted while this file is decoded.
+        with _unlimited_image_pixels(), Image.open(filename) as image:
+            width, height = art_studio._target_size(new_width, image.size)
+            if width <= 0 or height <= 0:
+                raise ValueError("height and width must be > 0")  # As raised by a single-process render
+            image.load()
+            source_size = image.size
+            source_memory = shared_memory.SharedMemory(create=True, size=source_size[0] * source_size[1])
+            try:
+                for top, bottom in self._row_tiles(source_size[1]):
+                    band = image.crop((0, top, source_size[0], bottom)).convert('L')
+                    source_memory.buf[top * source_size[0]:bottom * source_size[0]] = band.tobytes()
+            except BaseException:
+                source_memory.close()
+                source_memory.unlink()
+                raise
+        del image, band  # The decoded image is released before the workers start
+        return self._render_shared(art_studio, source_memory, source_size, (width, height))
+
+    def _render_shared(self, art_studio, source_memory, source_size, size):
+        """
+        Resize the grayscale source held in a shared memory block with the worker processes and map
+        the result to characters. The block is closed and unlinked afterwards.
+
+        Parameters:
+        - art_studio: ASCII_Art_Studio, the studio whose character ramp and tone curves apply.
+        - source_memory: SharedMemory, the grayscale source, row by row.
+        - source_size: tuple, the (width, height) of the source.
+        - size: tuple, the (width, height) of the resized image.
+
+        Returns:
+        - str, the ASCII art.
+        """
+        source_width, source_height = source_size
+        width, height = size
+        blocks = [source_memory]
+        try:
+            intermediate_memory = shared_memory.SharedMemory(create=True, size=width * source_height)
+            blocks.append(intermediate_memory)
+            output_memory = shared_memory.SharedMemory(create=True, size=width * height)
+            blocks.append(output_memory)
+
+            row_tiles = self._row_tiles(source_height)
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_lift_image_pixel_limit) as executor:
+                list(executor.map(_resample_rows, *zip(*[
+                    (source_memory.name, source_width, top, bottom, width, intermediate_memory.name)
+                    for top, bottom in row_tiles
+                ])))
+                list(executor.map(_resample_columns, *zip(*[
+                    (intermediate_memory.name, width, source_height, left, right, height, output_memory.name)
+                    for left, right in self._column_tiles(width)
+                ])))
+            resized = Image.frombytes('L', (width, height), bytes(output_memory.buf[:width * height]))
+            return art_studio._convert_to_ascii(resized)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
@@ -1,6 +1,11 @@
 # User_Interface.py
 
-from ASCII_Art_Studio import ASCII_Art_Studio
+# Only os and sys, which the interpreter has already loaded, are imported up front. Pillow and the
+# modules built on it (ASCII_Art_Studio, the batch renderer, the workspace, the tiled renderer and the
+# terminal player) are imported by the first command that needs them, so that short scripts such as
+# 'help' or 'info' start without paying for them.
+import os
+import sys
 
 class User_Interface:
     """
@@ -9,14 +14,20 @@ class User_Interface:
     rendering ASCII art, displaying image info, and quitting the application.
     """
 
-    def __init__(self, art_studio):
+    def __init__(self, art_studio=None, workspace=None, studio_options=None):
         """
         Initialize the User_Interface with a reference to an ASCII_Art_Studio instance.
 
         Parameters:
         - art_studio: An instance of ASCII_Art_Studio class for performing image to ASCII art conversions.
+          When omitted, one is created with `studio_options` by the first command that needs it.
+        - workspace: An optional Image_Workspace holding named images. By default a workspace is created
+          on first use whose studios share the settings and the render cache of `art_studio`.
+        - studio_options: dict, optional keyword arguments for the ASCII_Art_Studio created on demand.
         """
-        self.art_studio = art_studio  # Reference to the ASCII Art Studio for processing images
+        self._art_studio = art_studio  # Reference to the ASCII Art Studio for processing images
+        self._workspace = workspace    # Named images; `use` makes one of them the current studio
+        self.studio_options = studio_options or {}
         self.running = True  # Flag to control the main command loop
 
         # Commands dictionary maps command text to their handling methods for efficient command processing
@@ -24,33 +35,145 @@ class User_Interface:
             'load': self.load_command,
             'render': self.render_command,
             'info': self.info_command,
+            'use': self.use_command,
+            'list': self.list_command,
+            'batch': self.batch_command,
+            'grid': self.grid_command,
+            'gridrender': self.gridrender_command,
+            'tiled': self.tiled_command,
+            'animate': self.animate_command,
+            'watch': self.watch_command,
+            'stats': self.stats_command,
+            'ramp': self.ramp_command,
+            'curve': self.curve_command,
             'help': self.help_command,
             'quit': self.quit_command
         }
+        # Commands receiving the rest of the command line as one string instead of a list of words, so
+        # that their arguments can contain spaces.
+        self.raw_argument_commands = {'ramp'}
     
+    @property
+    def art_studio(self):
+        # The current studio, created on first access so that Pillow is only imported when needed.
+        if self._art_studio is None:
+            from ASCII_Art_Studio import ASCII_Art_Studio
+            self._art_studio = ASCII_Art_Studio(**self.studio_options)
+        return self._art_studio
+
+    @art_studio.setter
+    def art_studio(self, studio):
+        self._art_studio = studio
+
+    @property
+    def workspace(self):
+        # The workspace of named images, created on first access with studios sharing the settings and
+        # render cache of the studio current when each of them is created.
+        if self._workspace is None:
+            from Image_Workspace import Image_Workspace
+            self._workspace = Image_Workspace(studio_factory=self._new_studio)
+        return self._workspace
+
+    def _new_studio(self):
+        # Creates an empty studio with the settings, tone pipeline and render cache of the current one.
+        from ASCII_Art_Studio import ASCII_Art_Studio
+        art_studio = self.art_studio
+        studio = ASCII_Art_Studio(
+            engine=art_studio.engine, lazy=art_studio.lazy, render_cache=art_studio.render_cache,
+            pyramid=art_studio.pyramid, color=art_studio.color)
+        self._carry_tone(studio)
+        return studio
+
+    def _carry_tone(self, studio):
+        # Copies the character ramp, tone curves and auto-levels of the current studio to `studio`, so
+        # that they apply to the whole session rather than to one image.
+        art_studio = self.art_studio
+        studio.ramp = art_studio.ramp
+        studio.ascii_chars = art_studio.ascii_chars
+        studio.curves = list(art_studio.curves)
+        studio.auto_levels = art_studio.auto_levels
+
     def load_command(self, args):
         """
-        Handles the 'load' command to load an image file into the ASCII Art Studio.
+        Handles the 'load' command to load an image file into the ASCII Art Studio. With two arguments
+        the image is loaded into the workspace under a name and becomes the current image. With one
+        argument while a named image is current, the image is loaded into a new studio outside the
+        workspace, so that the named image is kept.
 
         Parameters:
-        - args: List of command arguments, expects the first element to be the filename.
+        - args: List of command arguments, expects the filename, or a name followed by the filename.
         """
-        if args:
+        from ASCII_Art_Studio import LOAD_SUCCESS_MESSAGE  # Imported here like the studio itself, for a fast startup
+        if len(args) > 1:
+            message = self.workspace.load(args[0], args[1])
+            print(message)
+            if message != LOAD_SUCCESS_MESSAGE:
+                return False
+            self._switch_studio(self.workspace.use(args[0]))
+        elif args:
             filename = args[0]  # First argument is assumed to be the filename
-            print(self.art_studio.load(filename))  # Load the image and print the result
+            detach = self._workspace is not None and self._workspace.active_name is not None
+            studio = self._new_studio() if detach else self.art_studio
+            message = studio.load(filename)
+            print(message)  # Print the result of loading the image
+            if message != LOAD_SUCCESS_MESSAGE:
+                return False
+            if detach:
+                self._switch_studio(studio)
+                self._workspace.active_name = None  # No named image is current any more
         else:
             # Make sure this message matches exactly with the expected message in the test case
             print("No filename provided. Please use the command as: load <filename>")
+            return False
 
     def render_command(self, args):
         """
         Handles the 'render' command to convert the currently loaded image into ASCII art.
+        The art is streamed band by band to the binary standard output, so even very wide renders
+        are never held in memory as a whole. The 'color' and 'color256' modes render colored art
+        with ANSI escape sequences and report the resulting bytes per character cell, the 'glyph'
+        mode picks characters by shape to preserve edges, and the 'tiled' mode spreads the resize
+        of very large images over all CPU cores.
 
         Parameters:
-        - args: List of command arguments, the first (optional) element can specify a custom width.
+        - args: List of command arguments, the first (optional) element can specify a custom width
+          and the second (optional) element a mode: 'ascii' (default), 'color', 'color256', 'glyph' or 'tiled'.
         """
+        from ASCII_Art_Studio import COLOR_PALETTES
+
         new_width = int(args[0]) if args else 50  # Default width is 50 characters if not specified
-        print(self.art_studio.render(new_width=new_width))  # Render and print the ASCII art
+        mode = args[1].lower() if len(args) > 1 else 'ascii'
+        if mode == 'color':
+            mode = 'truecolor'
+        if not self.art_studio.has_image():
+            print("No image loaded to render.")
+            return False
+        if mode in COLOR_PALETTES:
+            print(self.art_studio.render_color(new_width=new_width, palette=mode))
+            color_stats = self.art_studio.last_color_stats
+            print(f"Color output: {color_stats['bytes']} bytes, {color_stats['runs']} color runs, "
+                  f"{color_stats['bytes_per_cell']:.2f} bytes per cell")
+            return
+        if mode == 'glyph':
+            print(self.art_studio.render_glyph(new_width=new_width))
+            return
+        if mode == 'tiled':
+            from Tiled_Renderer import Tiled_Renderer
+
+            print(Tiled_Renderer().render(self.art_studio, new_width=new_width))
+            return
+        if mode != 'ascii':
+            print("Unknown render mode. Please use the command as: render [<width>] [ascii|color|color256|glyph|tiled]")
+            return False
+        stdout_buffer = getattr(sys.stdout, 'buffer', None)
+        if stdout_buffer is None:
+            # Without a binary stdout fall back to printing the complete result.
+            print(self.art_studio.render(new_width=new_width))
+            return
+        sys.stdout.flush()  # Keep earlier text output ahead of the bytes written below
+        self.art_studio.render_to(stdout_buffer, new_width=new_width)
+        stdout_buffer.write(b'\n')  # Match the blank line `print` used to add after the art
+        stdout_buffer.flush()
 
     def info_command(self, args):
         """
@@ -59,7 +182,257 @@ class User_Interface:
         Parameters:
         - args: List of command arguments, not used in this method.
         """
+        if self._art_studio is None:
+            # Nothing can have been loaded yet, so there is no need to create the studio.
+            print("No image loaded")
+            return
         print(self.art_studio.info())  # Print information about the current image
+        if self._workspace is not None and len(self.workspace):
+            # Renders may have added pyramid levels since the last load or use.
+            self.workspace.enforce_budget()
+            print(f"Decoded: {self.art_studio.decoded_bytes()} bytes")
+            print(self.workspace.format())
+
+    def use_command(self, args):
+        """
+        Handles the 'use' command to make a named image of the workspace the current image,
+        decoding it again if its pixel data was evicted to respect the memory budget.
+
+        Parameters:
+        - args: List of command arguments, expects the name of the image.
+        """
+        if not args:
+            print("No name provided. Please use the command as: use <name>")
+            return False
+        if args[0] not in self.workspace:
+            print(f"No image named '{args[0]}'. Use 'list' to see the loaded images.")
+            return False
+        self._switch_studio(self.workspace.use(args[0]))
+        print(f"Using '{args[0]}' ({self.art_studio.filename}).")
+
+    def list_command(self, args):
+        """
+        Handles the 'list' command to show the named images of the workspace, whether their pixel data
+        is resident or evicted, and the memory they use.
+
+        Parameters:
+        - args: List of command arguments, not used in this method.
+        """
+        if self._workspace is None or not len(self.workspace):
+            print("No named images. Please use the command as: load <name> <filename>")
+            return
+        print(self.workspace.format())
+
+    def _switch_studio(self, studio):
+        # Makes `studio` the current one, carrying over the stage timing settings and the tone pipeline
+        # of the previous studio.
+        studio.stats = self.art_studio.stats
+        self._carry_tone(studio)
+        self.art_studio = studio
+
+    def batch_command(self, args):
+        """
+        Handles the 'batch' command to render every image matching a glob pattern into text files
+        using all CPU cores. Each file is reported as it finishes, followed by a summary of any errors.
+
+        Parameters:
+        - args: List of command arguments, expects a glob pattern, a width and an output directory.
+        """
+        if len(args) < 3:
+            print("Missing arguments. Please use the command as: batch <glob> <width> <outdir>")
+            return False
+        return self._run_batch(args, 'text')
+
+    def _run_batch(self, args, output_format):
+        # Runs the batch renderer over a glob pattern, reporting each file as it finishes.
+        from Batch_Renderer import Batch_Renderer, format_summary
+
+        pattern, new_width, output_dir = args[0], int(args[1]), args[2]
+
+        def report(filename, output_path, error):
+            print(f"{filename} -> {output_path}" if error is None else f"{filename}: {error}")
+
+        summary = Batch_Renderer(output_format=output_format).run(pattern, new_width, output_dir, on_result=report)
+        print(format_summary(summary))
+        return not summary['failed']
+
+    def grid_command(self, args):
+        """
+        Handles the 'grid' command to convert every image matching a glob pattern into luminance grid
+        files in parallel, so that they can later be re-rendered with any character ramp without decoding.
+
+        Parameters:
+        - args: List of command arguments, expects a glob pattern, a width and an output directory.
+        """
+        if len(args) < 3:
+            print("Missing arguments. Please use the command as: grid <glob> <width> <outdir>")
+            return False
+        return self._run_batch(args, 'grid')
+
+    def gridrender_command(self, args):
+        """
+        Handles the 'gridrender' command to render a luminance grid file as ASCII art.
+
+        Parameters:
+        - args: List of command arguments, expects the grid filename, optionally followed by the name of a
+          registered character ramp or the characters of a ramp ordered from dark to light.
+        """
+        if not args:
+            print("No filename provided. Please use the command as: gridrender <file> [<ramp>]")
+            return False
+        from ASCII_Art_Studio import ASCII_CHARS, CHARACTER_RAMPS, Luminance_Grid
+
+        ascii_chars = CHARACTER_RAMPS.get(args[1], args[1]) if len(args) > 1 else ASCII_CHARS
+        with Luminance_Grid(args[0]) as grid:
+            print(grid.render(ascii_chars))
+
+    def tiled_command(self, args):
+        """
+        Handles the 'tiled' command to render an image file too large to load, such as a gigapixel
+        scan, with the tiled multi-process renderer and the current character ramp and tone curves.
+        The file is not loaded into the studio.
+
+        Parameters:
+        - args: List of command arguments, expects the filename, optionally followed by a width.
+        """
+        if not args:
+            print("No filename provided. Please use the command as: tiled <file> [<width>]")
+            return False
+        from Tiled_Renderer import Tiled_Renderer
+
+        new_width = int(args[1]) if len(args) > 1 else 50  # Default width is 50 characters if not specified
+        print(Tiled_Renderer().render_file(self.art_studio, args[0], new_width=new_width))
+
+    def animate_command(self, args):
+        """
+        Handles the 'animate' command to play every frame of the loaded image, such as an animated GIF,
+        as ASCII art at the frame rate of the source, then print the playback statistics.
+
+        Parameters:
+        - args: List of command arguments, optionally a width followed by the number of loops.
+        """
+        if not self.art_studio.has_image():
+            print("No image loaded to animate.")
+            return False
+        from Terminal_Player import Animation_Player, format_playback_stats
+
+        new_width = int(args[0]) if args else 50  # Default width is 50 characters if not specified
+        loops = int(args[1]) if len(args) > 1 else 1
+        sys.stdout.flush()  # Keep earlier text output ahead of the frames written below
+        player = Animation_Player(self.art_studio, sys.stdout.buffer, new_width=new_width, loops=loops)
+        print(format_playback_stats(player.play()))
+
+    def watch_command(self, args):
+        """
+        Handles the 'watch' command to show an image file as ASCII art and redraw the parts that change
+        whenever another process overwrites the file, until interrupted with Ctrl+C.
+
+        Parameters:
+        - args: List of command arguments, expects the filename, optionally followed by a width.
+        """
+        if not args:
+            print("No filename provided. Please use the command as: watch <filename> [<width>]")
+            return False
+        if not os.path.isfile(args[0]):
+            print("The specified file was not found.")
+            return False
+        from Terminal_Player import Image_Watcher, format_watch_stats
+
+        new_width = int(args[1]) if len(args) > 1 else 50  # Default width is 50 characters if not specified
+        sys.stdout.flush()  # Keep earlier text output ahead of the screens written below
+        watcher = Image_Watcher(self.art_studio, args[0], sys.stdout.buffer, new_width=new_width)
+        print(format_watch_stats(watcher.watch()))
+
+    def stats_command(self, args):
+        """
+        Handles the 'stats' command to control the per-stage timing instrumentation and show its results.
+        Without arguments it prints the timings of every stage and the render cache counters.
+
+        Parameters:
+        - args: List of command arguments, optionally 'on', 'off', 'reset' or 'json' followed by a filename.
+        """
+        action = args[0].lower() if args else 'show'
+        if action == 'on':
+            from ASCII_Art_Studio import Stage_Stats
+
+            if self.art_studio.stats is None:
+                self.art_studio.stats = Stage_Stats()
+            print("Stage timing enabled.")
+            return
+        if action == 'off':
+            self.art_studio.stats = None
+            print("Stage timing disabled.")
+            return
+        if self.art_studio.stats is None:
+            print("Stage timing is disabled. Use 'stats on' to enable it.")
+            return
+        if action == 'reset':
+            self.art_studio.stats.reset()
+            print("Stage timings cleared.")
+        elif action == 'json':
+            import json
+
+            report = dict(self.art_studio.stats.as_dict(), render_cache=self.art_studio.render_cache.stats())
+            if len(args) > 1:
+                with open(args[1], 'w') as json_file:
+                    json.dump(report, json_file, indent=2)
+                print(f"Stage timings written to {args[1]}")
+            else:
+                print(json.dumps(report, indent=2))
+        elif action == 'show':
+            print(self.art_studio.stats.format())
+            cache_stats = self.art_studio.render_cache.stats()
+            print(f"Render cache: {cache_stats['entries']} entries, {cache_stats['bytes']} bytes, "
+                  f"{cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['evictions']} evictions")
+        else:
+            print("Unknown option. Please use the command as: stats [on|off|reset|json [<file>]]")
+            return False
+
+    def ramp_command(self, args):
+        """
+        Handles the 'ramp' command to list the character ramps, select one, or register a new one.
+
+        Parameters:
+        - args: str, the rest of the command line: nothing to list the ramps, a name to select a ramp, or
+          a name followed by characters ordered from dark to light to register and select a new ramp.
+          The characters may contain spaces; quoting them keeps spaces at their ends, as in
+          'ramp mine "#=-. "'.
+        """
+        from ASCII_Art_Studio import CHARACTER_RAMPS, register_ramp
+
+        if not args:
+            for name, ascii_chars in CHARACTER_RAMPS.items():
+                marker = '*' if name == self.art_studio.ramp else ' '
+                print(f"{marker} {name:<12}{ascii_chars}")
+            return
+        name, _, ascii_chars = args.partition(' ')
+        ascii_chars = ascii_chars.strip()
+        if len(ascii_chars) > 1 and ascii_chars[0] == ascii_chars[-1] and ascii_chars[0] in '"\'':
+            ascii_chars = ascii_chars[1:-1]
+        if ascii_chars:
+            register_ramp(name, ascii_chars)
+        self.art_studio.set_ramp(name)
+        print(f"Character ramp set to '{name}'.")
+
+    def curve_command(self, args):
+        """
+        Handles the 'curve' command to build the tone pipeline applied before the character ramp.
+        Curves apply in the order they are added and are folded with the ramp into a single lookup table.
+
+        Parameters:
+        - args: List of command arguments: nothing to show the pipeline, 'auto' to stretch the levels of
+          each resized image, 'reset' to remove every curve, or a curve name followed by its parameters,
+          e.g. 'gamma 2.2', 'contrast 1.5' or 'invert'.
+        """
+        if args and args[0].lower() == 'reset':
+            self.art_studio.clear_curves()
+        elif args and args[0].lower() == 'auto':
+            self.art_studio.auto_levels = True
+        elif args:
+            self.art_studio.add_curve(args[0].lower(), *[float(value) for value in args[1:]])
+        steps = ['auto-levels'] if self.art_studio.auto_levels else []
+        steps += [' '.join([name] + [f"{value:g}" for value in parameters]) for name, parameters in self.art_studio.curves]
+        print(f"Tone curves: {', '.join(steps) if steps else 'none'}")
 
     def help_command(self, args):
         """
@@ -84,39 +457,118 @@ class User_Interface:
         """Displays a list of available commands and their usage to the user."""
         help_text = """
         Available commands:
-          load <filename>   : Load an image file into the studio.
-          render [<width>]  : Render the loaded image as ASCII art with an optional width.
+          load [<name>] <filename> : Load an image file into the studio, optionally as a named image.
+          use <name>        : Switch to a named image, decoding it again if it was evicted.
+          list              : List the named images, their state and memory usage.
+          render [<width>] [ascii|color|color256|glyph|tiled] : Render the loaded image as ASCII art with an optional width.
           info              : Display information about the current image.
+          batch <glob> <width> <outdir> : Render all matching images to text files in parallel.
+          grid <glob> <width> <outdir> : Convert all matching images to luminance grid files in parallel.
+          gridrender <file> [<ramp>] : Render a luminance grid file, optionally with another character ramp.
+          tiled <file> [<width>] : Render an image file too large to load in tiles across all CPU cores.
+          animate [<width>] [<loops>] : Play all frames of the loaded image, e.g. an animated GIF.
+          watch <filename> [<width>] : Show an image file and redraw what changes when it is overwritten.
+          stats [on|off|reset|json [<file>]] : Show or export per-stage timings.
+          ramp [<name> [<characters>]] : List, select or register character ramps; quote characters ending in spaces.
+          curve [auto|reset|<name> [<values>]] : Show or extend the tone curves, e.g. curve gamma 2.2.
           help              : Show this help message.
           quit              : Exit the ASCII Art Studio.
         """
         print(help_text.strip())
 
+    def execute(self, command_line):
+        """
+        Runs a single command line, reporting any error as a message.
+
+        Parameters:
+        - command_line: str, the command followed by its arguments.
+
+        Returns:
+        - bool, False when the command was unknown or failed, True otherwise.
+        """
+        try:
+            command_input = command_line.strip().split()
+            command = command_input[0].lower()  # Convert command to lowercase for case-insensitive comparison
+            args = command_input[1:]  # Separate the command from its arguments
+            if command in self.raw_argument_commands:
+                args = command_line.lstrip()[len(command_input[0]):].strip()
+
+            if command in self.commands:
+                return self.commands[command](args) is not False  # Execute the command if recognized
+            print("Unknown command. Type 'help' for a list of commands.")
+        except KeyError:
+            print("Invalid command format. Type 'help' for command usage.")
+        except ValueError as ve:
+            print(f"Value Error: {ve}. Check command arguments.")
+        except IOError as io:
+            print(f"IO Error: {io}. Check file paths and permissions.")
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}. Please try again or check the command syntax.")
+        return False
+
     def run(self):
         """
-        Starts the command loop for the user interface, accepting and processing commands until 'quit'.
+        Starts the command loop for the user interface, accepting and processing commands until 'quit'
+        or the end of the input.
         """
         print("Welcome to ASCII Art Studio!\nType 'help' for a list of commands.")
         while self.running:
             try:
-                command_input = input("AAS> ").strip().split()
-                command = command_input[0].lower()  # Convert command to lowercase for case-insensitive comparison
-                args = command_input[1:]  # Separate the command from its arguments
-
-                if command in self.commands:
-                    self.commands[command](args)  # Execute the command if recognized
-                else:
-                    print("Unknown command. Type 'help' for a list of commands.")
-            except KeyError:
-                print("Invalid command format. Type 'help' for command usage.")
-            except ValueError as ve:
-                print(f"Value Error: {ve}. Check command arguments.")
-            except IOError as io:
-                print(f"IO Error: {io}. Check file paths and permissions.")
-            except Exception as e:
-                print(f"An unexpected error occurred: {e}. Please try again or check the command syntax.")
+                command_line = input("AAS> ")
+            except EOFError:
+                break
+            self.execute(command_line)
+
+    def run_script(self, script):
+        """
+        Runs commands without a banner or prompts, stopping at the first command that fails.
+        Commands are separated by newlines or semicolons; blank lines and lines starting with '#' are skipped.
+
+        Parameters:
+        - script: str or iterable of str, the commands to run, such as the text of a script file or `sys.stdin`.
+
+        Returns:
+        - int, the exit status: 0 when every command succeeded, 1 otherwise.
+        """
+        lines = script.splitlines() if isinstance(script, str) else script
+        for line_number, line in enumerate(lines, 1):
+            if line.lstrip().startswith('#'):
+                continue
+            for command_line in line.split(';'):
+                if not command_line.strip():
+                    continue
+                if not self.execute(command_line):
+                    print(f"Script stopped at line {line_number}: {command_line.strip()}", file=sys.stderr)
+                    return 1
+                if not self.running:
+                    return 0
+        return 0
+
+SCRIPT_USAGE = """usage: User_Interface.py [--pyramid] [-c COMMANDS | SCRIPT | -]
+
+Without arguments the interactive command loop starts, unless standard input is not a terminal, in
+which case commands are read from it as a script. '-c' runs the given commands, separated by
+semicolons, SCRIPT runs the commands in a file and '-' reads them from standard input. Scripts run
+without a banner or prompts and exit with status 1 at the first failing command. '--pyramid' makes
+renders resample from a mip pyramid of the image, which is faster when one image is rendered at
+several widths but only approximates the exact output of a direct resize."""
 
 if __name__ == "__main__":
-    studio = ASCII_Art_Studio()  # Create an instance of ASCII_Art_Studio
-    ui = User_Interface(studio)  # Initialize the User_Interface with the studio instance
-    ui.run()  # Start the command loop
\ No newline at end of file
+    # Arguments are parsed by hand because importing argparse would cost more than a short script takes to run.
+    arguments = sys.argv[1:]
+    # Renders are exact unless the approximate, faster resampling from the mip pyramid is asked for.
+    pyramid = '--pyramid' in arguments
+    arguments = [argument for argument in arguments if argument != '--pyramid']
+    ui = User_Interface(studio_options={'pyramid': pyramid})  # The studio is created by the first command needing it
+    if not arguments and sys.stdin.isatty():
+        ui.run()  # Start the command loop
+    elif not arguments or arguments == ['-']:
+        raise SystemExit(ui.run_script(sys.stdin))
+    elif arguments[0] == '-c' and len(arguments) == 2:
+        raise SystemExit(ui.run_script(arguments[1]))
+    elif len(arguments) == 1 and not arguments[0].startswith('-'):
+        with open(arguments[0]) as script_file:
+            raise SystemExit(ui.run_script(script_file))
+    else:
+        print(SCRIPT_USAGE, file=sys.stderr)
+        raise SystemExit(2)
\ No newline at end of file